@@ -0,0 +1,47 @@
+"""
+Raw Hashids against the cached BetterHashids codec.
+
+    python -m benchmarks.hashids_codec [iterations]
+
+The workload repeats a small set of ids, like the same polls being rendered,
+autocompleted and clicked over and over.
+"""
+import random
+import sys
+import timeit
+
+from hashids import Hashids
+
+from imp.better.hashids import BetterHashids
+
+IDS = 1_000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    raw = Hashids(salt="benchmark", min_length=6)
+    cached = BetterHashids(Hashids(salt="benchmark", min_length=6))
+
+    values = [random.randrange(1, 10_000_000) for _ in range(IDS)]
+    workload = [random.choice(values) for _ in range(iterations)]
+    hids = [raw.encode(value) for value in workload]
+
+    for name, codec in (("raw", raw), ("cached", cached)):
+        encode = iter(workload)
+        encode_time = timeit.timeit(lambda: codec.encode(next(encode)), number=iterations)
+
+        decode = iter(hids)
+        decode_time = timeit.timeit(lambda: codec.decode(next(decode)), number=iterations)
+
+        print(
+            f"{name:>6}: encode {encode_time / iterations * 1e6:6.2f}us  "
+            f"decode {decode_time / iterations * 1e6:6.2f}us"
+        )
+
+    batch_time = timeit.timeit(lambda: cached.encode_many(values), number=10) / 10
+    print(f"encode_many({IDS}) cached: {batch_time * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Cold import cost of the bot's command module, with and without matplotlib.
+
+    python -m benchmarks.import_time [runs]
+
+Every sample runs in a fresh interpreter. "cogs.main + pyplot" is what loading
+the cog cost while it imported matplotlib.pyplot at module level.
+"""
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+SAMPLE = """
+import resource, time
+started = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - started
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+CASES = {
+    "cogs.main": "import cogs.main",
+    "cogs.main + pyplot": "import cogs.main\nimport matplotlib.pyplot",
+}
+
+
+def sample(imports: str) -> Tuple[float, int]:
+    output = subprocess.check_output([sys.executable, "-c", SAMPLE.format(imports=imports)], text=True)
+    elapsed, max_rss = output.split()
+    return float(elapsed), int(max_rss)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = {}
+
+    for name, imports in CASES.items():
+        samples: List[Tuple[float, int]] = [sample(imports) for _ in range(runs)]
+        results[name] = (
+            statistics.median(elapsed for elapsed, _ in samples),
+            statistics.median(max_rss for _, max_rss in samples)
+        )
+        print(f"{name:20} {results[name][0] * 1000:8.1f}ms  {results[name][1] / 1024:7.1f}MiB max rss")
+
+    (fast, fast_rss), (slow, slow_rss) = results["cogs.main"], results["cogs.main + pyplot"]
+    print(f"{'startup delta':20} {(slow - fast) * 1000:8.1f}ms  {(slow_rss - fast_rss) / 1024:7.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Time the event loop spends inside 10k log calls.
+
+    python -m benchmarks.logger_stall [calls]
+
+"print" is the old BetterLogger, which formatted and printed on the loop. "queued"
+is the current one at INFO, and "disabled" is a DEBUG call while the level is INFO.
+Output goes to a pipe that a thread drains, like a terminal or a log collector.
+The fast sink reads the pipe as fast as it can. The slow sink reads 4 KiB per
+millisecond, like a terminal or log driver that is falling behind.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from imp.better.logger import BetterLogger, start_logging, stop_logging
+from imp.data.colors import Colors
+
+
+class PrintLogger:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def log(self, agent: str, message: str, color: str = Colors.GREEN):
+        print(
+            "%s%s[%s%s%s%s%s]%s %s[%s%s%s%s@%s%s%s%s]%s ~ %s%s%s" % (
+                Colors.E, Colors.BOLD, Colors.E, Colors.B, datetime.now(), Colors.E, Colors.BOLD, Colors.E,
+                Colors.BOLD, Colors.E, Colors.C, agent, Colors.E, Colors.C, self.__class__.__name__, Colors.E,
+                Colors.BOLD, Colors.E, color, message, Colors.E
+            ),
+            file=self.stream
+        )
+
+
+class Benchmark(BetterLogger):
+    pass
+
+
+def drained_pipe(delay: float):
+    read, write = os.pipe()
+
+    def drain():
+        with os.fdopen(read, "rb", buffering=0) as f:
+            while f.read(4096):
+                time.sleep(delay)
+
+    threading.Thread(target=drain, daemon=True).start()
+    return os.fdopen(write, "w", buffering=1)
+
+
+async def stall(log, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        log(i)
+    return time.perf_counter() - start
+
+
+async def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    for sink, delay in (("fast", 0.0), ("slow", 0.001)):
+        printer = PrintLogger(drained_pipe(delay))
+        print_time = await stall(lambda i: printer.log("benchmark", f"Updated poll {i}"), calls)
+
+        start_logging("INFO", stream=drained_pipe(delay))
+        logger = Benchmark()
+        queued_time = await stall(lambda i: logger.log("benchmark", "Updated poll %d", Colors.GREEN, i), calls)
+        disabled_time = await stall(
+            lambda i: logger.log("benchmark", "Updated poll %d", Colors.GREEN, i, level=logging.DEBUG), calls
+        )
+        # not timed, the listener thread writes the backlog here
+        stop_logging()
+
+        for name, elapsed in (("print", print_time), ("queued", queued_time), ("disabled", disabled_time)):
+            print(f"{sink} sink {name:>8}: {elapsed * 1000:8.2f}ms on the loop for {calls} calls")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
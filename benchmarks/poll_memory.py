@@ -0,0 +1,83 @@
+"""
+Bytes per cached poll for a 100k poll fixture.
+
+    python -m benchmarks.poll_memory [count]
+
+`LegacyPoll` mirrors the attributes the dict backed Poll used to carry, so both
+layouts are measured with the same fixture data.
+"""
+import sys
+import tracemalloc
+from typing import Callable, List
+
+from imp.classes.config import PollConfig
+from imp.classes.poll import Poll
+
+
+class LegacyPoll:
+    def __init__(self, client, poll_rid: int):
+        self.client = client
+        self._rid = poll_rid
+        self._hid = None
+
+        self._guild_rid = None
+        self._guild_hid = None
+        self._channel_id = None
+        self._message_id = None
+        self.view = None
+        self._last_vote = None
+        self._started = None
+        self._title = None
+        self._description = None
+
+
+def legacy_poll(i: int) -> LegacyPoll:
+    poll = LegacyPoll(None, i)
+    poll._guild_rid = i % 500
+    poll._channel_id = 900000000000000000 + i
+    poll._message_id = 950000000000000000 + i
+    poll._title = f"POLL {i}"
+    poll._description = f"Description of poll {i}"
+    poll._started = bool(i % 2)
+    return poll
+
+
+def slotted_poll(i: int) -> Poll:
+    poll = Poll(None, i)
+    poll._config = PollConfig(
+        guild_rid=i % 500,
+        channel_id=900000000000000000 + i,
+        message_id=950000000000000000 + i,
+        title=f"POLL {i}",
+        description=f"Description of poll {i}"
+    )
+    poll._started = bool(i % 2)
+    return poll
+
+
+def measure(factory: Callable[[int], object], count: int) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    polls: List[object] = [factory(i) for i in range(count)]
+
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # the list holding the fixture is not part of a poll
+    return (after - before - sys.getsizeof(polls)) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    legacy = measure(legacy_poll, count)
+    slotted = measure(slotted_poll, count)
+
+    print(f"{count} polls")
+    print(f"dict backed: {legacy:8.1f} bytes/poll")
+    print(f"__slots__:   {slotted:8.1f} bytes/poll ({(1 - slotted / legacy) * 100:.1f}% less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Embed rendering cost for 1 and 8 options with 0 and 1M votes.
+
+    python -m benchmarks.poll_render [iterations]
+
+"cold" renders a new vote vector every iteration, "memoized" renders the same
+snapshot again, which is what an update without new votes costs.
+"""
+import sys
+import timeit
+
+from imp.classes.renderer import PollRenderer
+from imp.classes.snapshot import OptionSnapshot, PollSnapshot
+
+
+class StaticTranslator:
+    def translate_sync(self, language, /, key: str, **format_args) -> str:
+        return key + "".join(f" {value}" for value in format_args.values())
+
+
+def snapshot(options: int, votes: int) -> PollSnapshot:
+    per_option, rest = divmod(votes, options)
+
+    return PollSnapshot(
+        rid=1,
+        guild_rid=1,
+        started=True,
+        title="BENCHMARK",
+        description="Which option is the best one?",
+        channel_id=1,
+        message_id=1,
+        language="en-us",
+        options=tuple(
+            OptionSnapshot(rid=i, name=f"Option {i}", vote_count=per_option + (i < rest)) for i in range(options)
+        )
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    for options in (1, 8):
+        for votes in (0, 1_000_000):
+            renderer = PollRenderer(StaticTranslator())
+            base = snapshot(options, votes)
+            vectors = [
+                base.with_counts({0: votes + i}) for i in range(iterations)
+            ]
+
+            cold = iter(vectors)
+            cold_time = timeit.timeit(lambda: renderer.render(next(cold), "bench"), number=iterations)
+            memo_time = timeit.timeit(lambda: renderer.render(base, "bench"), number=iterations)
+
+            print(
+                f"{options} option(s), {votes:>9} votes: "
+                f"cold {cold_time / iterations * 1e6:7.2f}us  memoized {memo_time / iterations * 1e6:7.2f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from discord import app_commands
+
+from imp.better.cog import BetterCog
+from imp.better.metrics import METRICS
+from imp.data.colors import Colors
+
+if TYPE_CHECKING:
+    from imp.better.bot import BetterBot
+    from imp.better.interaction import BetterInteraction
+
+
+class Admin(BetterCog):
+    group = app_commands.Group(
+        name="admin",
+        description="Bot maintenance"
+    )
+
+    async def interaction_check(self, interaction: BetterInteraction) -> bool:
+        # maintenance commands touch every guild, only the bot owner may run them
+        if await self.client.is_owner(interaction.user):
+            return True
+
+        await interaction.response.send_message(content="Only the bot owner can use this.", ephemeral=True)
+        return False
+
+    @group.command(
+        name="vote_counts",
+        description="Check the stored vote counters against the votes"
+    )
+    @app_commands.describe(
+        repair="Repair the counters that drifted"
+    )
+    async def vote_counts(
+            self,
+            interaction: BetterInteraction,
+            repair: bool = False
+    ):
+        await interaction.response.defer(ephemeral=True)
+
+        async with self.client.acquire("command.admin_vote_counts") as cursor:
+            drift = await self.client.database.vote_count_drift(cursor)
+
+            if repair:
+                options, polls = await self.client.database.repair_vote_counts(cursor)
+
+        if not repair:
+            lines = [
+                f"poll {poll} option {option}: stored {stored}, counted {counted}"
+                for poll, option, stored, counted in drift[:20]
+            ]
+            return await interaction.followup.send(
+                content=f"{len(drift)} option counter(s) drifted\n" + "\n".join(lines),
+                ephemeral=True
+            )
+
+        self.log("vote_counts", f"Repaired {options} option and {polls} poll counter(s)", Colors.YELLOW)
+        await interaction.followup.send(
+            content=f"Repaired {options} option and {polls} poll counter(s)",
+            ephemeral=True
+        )
+
+    @group.command(
+        name="metrics",
+        description="Show the slowest hot paths"
+    )
+    async def metrics(
+            self,
+            interaction: BetterInteraction
+    ):
+        if not METRICS.enabled:
+            return await interaction.response.send_message(content="Metrics are disabled.", ephemeral=True)
+
+        # ordered by total time spent, so the first rows are the ones worth optimizing
+        lines = [f"{'name':<32} {'count':>8} {'p50':>9} {'p95':>9} {'p99':>9}"]
+        for name, count, p50, p95, p99 in METRICS.summary()[:25]:
+            lines.append(f"{name[:32]:<32} {count:>8} {p50 * 1000:>7.1f}ms {p95 * 1000:>7.1f}ms {p99 * 1000:>7.1f}ms")
+
+        await interaction.response.send_message(content="```\n" + "\n".join(lines) + "\n```", ephemeral=True)
+
+    @group.command(
+        name="pool",
+        description="Show connection pool usage and guard violations"
+    )
+    async def pool(
+            self,
+            interaction: BetterInteraction
+    ):
+        stats = self.client.pool_guard.stats(self.client.pool)
+        lines = [f"{key}: {value}" for key, value in stats.items()]
+
+        violations = sorted(self.client.pool_guard.violations.items(), key=lambda item: item[1], reverse=True)
+        lines.extend(f"{name}: {count}" for name, count in violations[:20])
+
+        await interaction.response.send_message(content="```\n" + "\n".join(lines) + "\n```", ephemeral=True)
+
+
+async def setup(client: BetterBot):
+    await client.add_cog(Admin(client), guilds=client.config["guilds"])
@@ -2,34 +2,40 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from discord import Guild
+from discord import Guild, InteractionType
 
 from imp.better.cog import BetterCog
 
 if TYPE_CHECKING:
     from imp.better.bot import BetterBot
+    from imp.better.interaction import BetterInteraction
 
 
 class Listeners(BetterCog):
 
     @BetterCog.listener()
     async def on_guild_join(self, guild: Guild):
-        async with self.client.pool.acquire() as cursor:
-            guild_exists = await self.client.database.guild_id_exists(
-                cursor,
+        async with self.client.unit_of_work("guild_join") as unit:
+            guild_exists = await unit.database.guild_id_exists(
                 guild_id=guild.id
             )
 
             if not guild_exists:
                 self.log("on_guild_join", f"Joined guild: {guild.id} | Not exists")
-                await self.client.database.create_guild(
-                    cursor,
+                await unit.database.create_guild(
                     guild_id=guild.id
                 )
 
             else:
                 self.log("on_guild_join", f"Joined guild: {guild.id} | Already exists")
 
+        self.client.guild_cache.invalidate_guild_id(guild.id)
+
+    @BetterCog.listener()
+    async def on_interaction(self, interaction: BetterInteraction):
+        if interaction.type is InteractionType.component:
+            await self.client.poll_dispatcher.dispatch(interaction)
+
 
 async def setup(client: BetterBot):
     await client.add_cog(Listeners(client), guilds=client.config["guilds"])
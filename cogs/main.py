@@ -7,9 +7,12 @@ import discord
 from discord import app_commands, Embed
 
 from imp.better.cog import BetterCog
+from imp.charts import ChartCache
+from imp.classes import Poll
+from imp.classes.renderer import render_options
+from imp.errors import ChartPoolBusy
 from imp.transformers import POLL_TRANSFORMER, LANGUAGE_TRANSFORMER
 from imp.views.poll import PollView
-import matplotlib.pyplot as plt
 
 if TYPE_CHECKING:
     from imp.better.bot import BetterBot
@@ -24,80 +27,107 @@ class Main(BetterCog):
     )
     @app_commands.describe(
         title="The name of the poll",
-        description="Some info for the poll"
+        description="Some info for the poll",
+        options="The options of the poll, separated by ;"
     )
-    async def create_poll(self, interaction: BetterInteraction, title: str, description: str = None):
-        async with self.client.pool.acquire() as cursor:
-            _guild_hid = await self.client.database.get_guild_rid(
+    async def create_poll(
+            self,
+            interaction: BetterInteraction,
+            title: str,
+            description: str = None,
+            options: str = None
+    ):
+        names = Poll.parse_options(options)
+
+        # the connection is never held across a discord call, the message is sent between the two leases
+        async with self.client.acquire("command.create") as cursor:
+            _guild_hid = await self.client.guild_cache.guild_rid(
                 cursor,
                 guild_id=interaction.guild.id
             )
+            language = await self.client.guild_cache.language(
+                cursor,
+                guild_rid=_guild_hid
+            )
 
-            message = await interaction.channel.send(
-                embed=Embed(
-                    title=await self.client.translator.translate(
-                        cursor,
-                        guild_rid=_guild_hid,
-                        key="poll.title",
-                        name=title
-                    ),
-                    description=f"```\n{description}```",
-                    colour=discord.Colour.yellow()
-                )
-                .set_footer(
-                    text=await self.client.translator.translate(
-                        cursor,
-                        guild_rid=_guild_hid,
-                        key="poll.footer",
-                        id="#~"
-                    )
-                )
+        if len(names) > Poll.POLL_MAX_OPTIONS:
+            return await interaction.response.send_message(
+                content=self.client.translator.translate_sync(
+                    language,
+                    key="poll.add_option.maximum_reached",
+                    count=Poll.POLL_MAX_OPTIONS
+                ),
+                ephemeral=True
             )
 
-            poll_id = await self.client.database.create_poll(
-                cursor,
-                guild_rid=_guild_hid,
-                channel_id=message.channel.id,
-                message_id=message.id,
-                poll_title=title.upper(),
-                poll_description=description
+        message = await interaction.channel.send(
+            embed=Embed(
+                title=self.client.translator.translate_sync(
+                    language,
+                    key="poll.title",
+                    name=title
+                ),
+                description=f"```\n{description}```",
+                colour=discord.Colour.yellow()
             )
-            poll = self.client.manager.get_poll(poll_id)
-            view = await PollView(poll).run(cursor)
-            poll.set_view(view)
-
-            self.client.manager.set_poll(poll)
-
-            await message.edit(
-                embed=(message.embeds[0].set_footer(
-                    text=await self.client.translator.translate(
-                        cursor,
-                        guild_rid=_guild_hid,
-                        key="poll.footer",
-                        id=poll.hid
-                    )
-                )),
-                view=view
+            .set_footer(
+                text=self.client.translator.translate_sync(
+                    language,
+                    key="poll.footer",
+                    id="#~"
+                )
             )
+        )
 
-            return await interaction.response.send_message(
-                content=await self.client.translator.translate(
+        async with self.client.acquire("command.create") as cursor:
+            async with cursor.transaction():
+                poll_id = await self.client.database.create_poll(
                     cursor,
                     guild_rid=_guild_hid,
-                    key="poll.create.success",
-                    title=title,
-                    id=poll.hid
-                ),
-                ephemeral=True
-            )
+                    channel_id=message.channel.id,
+                    message_id=message.id,
+                    poll_title=title.upper(),
+                    poll_description=description
+                )
+                poll = self.client.manager.get_poll(poll_id)
+
+                if names:
+                    await poll.add_options(cursor, names)
+
+            snapshot = await poll.snapshot(cursor)
+
+        self.client.manager.tally.track(poll.rid)
+        self.client.autocomplete.add_snapshot(snapshot)
+        view = PollView(poll).build(snapshot)
+        poll.set_view(view)
+
+        rendered, _ = self.client.renderer.render(snapshot, poll.hid)
+        await message.edit(
+            embed=Embed(
+                title=rendered.title,
+                description=rendered.description,
+                colour=discord.Colour.yellow()
+            ).set_footer(text=rendered.footer),
+            view=view
+        )
+
+        await interaction.response.send_message(
+            content=self.client.translator.translate_sync(
+                language,
+                key="poll.create.success",
+                title=title,
+                id=poll.hid
+            ),
+            ephemeral=True
+        )
 
     @app_commands.command(
         name="add_option",
-        description="Add a option to a poll"
+        description="Add options to a poll"
     )
     @app_commands.describe(
-        poll="The poll to which the option should be added",
-        name="The option name"
+        poll="The poll to which the options should be added",
+        name="The option name, multiple options are separated by ;"
     )
     async def add_option(
             self,
@@ -105,49 +135,70 @@ class Main(BetterCog):
             poll: POLL_TRANSFORMER,
             name: str
     ):
-        async with self.client.pool.acquire() as cursor:
-            _guild_hid = await self.client.database.get_guild_rid(
-                cursor,
+        names = Poll.parse_options(name)
+
+        if not names:
+            # only separators or whitespace, there is nothing to write
+            async with self.client.acquire("command.add_option") as cursor:
+                language = await self.client.guild_cache.language(
+                    cursor,
+                    guild_rid=await self.client.guild_cache.guild_rid(cursor, guild_id=interaction.guild.id)
+                )
+
+            return await interaction.response.send_message(
+                content=self.client.translator.translate_sync(
+                    language,
+                    key="poll.add_option.empty"
+                ),
+                ephemeral=True
+            )
+
+        async with self.client.unit_of_work("command.add_option") as unit:
+            _guild_hid = await self.client.guild_cache.guild_rid(
+                unit.cursor,
                 guild_id=interaction.guild.id
             )
+            language = await self.client.guild_cache.language(
+                unit.cursor,
+                guild_rid=_guild_hid
+            )
 
-            if await poll.started(cursor):
-                return await interaction.response.send_message(
-                    content=await self.client.translator.translate(
-                        cursor,
-                        guild_rid=_guild_hid,
-                        key="poll.add_option.already_started",
-                        id=poll.hid
-                    ),
-                    ephemeral=True
+            snapshot = None
+            if await poll.started(unit.cursor):
+                content = self.client.translator.translate_sync(
+                    language,
+                    key="poll.add_option.already_started",
+                    id=poll.hid
                 )
 
-            if await poll.option_count(cursor) > poll.POLL_MAX_OPTIONS:
-                return await interaction.response.send_message(
-                    content=await self.client.translator.translate(
-                        cursor,
-                        guild_rid=_guild_hid,
-                        key="poll.add_option.maximum_reached",
-                        count=poll.POLL_MAX_OPTIONS
-                    ),
-                    ephemeral=True
+            elif await poll.option_count(unit.cursor) + len(names) > poll.POLL_MAX_OPTIONS:
+                content = self.client.translator.translate_sync(
+                    language,
+                    key="poll.add_option.maximum_reached",
+                    count=poll.POLL_MAX_OPTIONS
                 )
 
-            await poll.add_option(cursor, name)
-
-            await poll.update(cursor)
-            self.client.manager.set_poll(poll)
+            else:
+                option_rids = await poll.add_options(unit.cursor, names)
+                snapshot = await poll.snapshot(unit.cursor)
 
-            await interaction.response.send_message(
-                content=await self.client.translator.translate(
-                    cursor,
-                    guild_rid=_guild_hid,
+                content = self.client.translator.translate_sync(
+                    language,
                     key="poll.add_option.success",
                     id=poll.hid,
-                    option=name
-                ),
-                ephemeral=True
-            )
+                    option=", ".join(names)
+                )
+
+        if snapshot is not None:
+            self.client.autocomplete.add_options(poll.rid, zip(option_rids, names))
+
+        # committed before talking to discord, a failed response can no longer roll the options back
+        await interaction.response.send_message(
+            content=content,
+            ephemeral=True
+        )
+        if snapshot is not None:
+            await poll.show(snapshot)
 
     @app_commands.command(
         name="start",
@@ -161,35 +212,39 @@ class Main(BetterCog):
             interaction: BetterInteraction,
             poll: POLL_TRANSFORMER
     ):
-        async with self.client.pool.acquire() as cursor:
-            _guild_hid = await self.client.database.get_guild_rid(
-                cursor,
+        async with self.client.unit_of_work("command.start") as unit:
+            _guild_hid = await self.client.guild_cache.guild_rid(
+                unit.cursor,
                 guild_id=interaction.guild.id
             )
+            language = await self.client.guild_cache.language(
+                unit.cursor,
+                guild_rid=_guild_hid
+            )
 
-            if await poll.started(cursor):
-                return await interaction.response.send_message(
-                    content=await self.client.translator.translate(
-                        cursor,
-                        guild_rid=_guild_hid,
-                        key="poll.start.already_started",
-                        id=poll.hid
-                    ),
-                    ephemeral=True
+            snapshot = None
+            if await poll.started(unit.cursor):
+                content = self.client.translator.translate_sync(
+                    language,
+                    key="poll.start.already_started",
+                    id=poll.hid
                 )
 
-            await poll.start(cursor)
-            self.client.manager.set_poll(poll)
+            else:
+                snapshot = await poll.start(unit.cursor)
 
-            await interaction.response.send_message(
-                content=await self.client.translator.translate(
-                    cursor,
-                    guild_rid=_guild_hid,
+                content = self.client.translator.translate_sync(
+                    language,
                     key="poll.start.success",
                     id=poll.hid
-                ),
-                ephemeral=True
-            )
+                )
+
+        await interaction.response.send_message(
+            content=content,
+            ephemeral=True
+        )
+        if snapshot is not None:
+            await poll.show_started(snapshot)
 
     @app_commands.command(
         name="stop",
@@ -203,35 +258,43 @@ class Main(BetterCog):
             interaction: BetterInteraction,
             poll: POLL_TRANSFORMER
     ):
-        async with self.client.pool.acquire() as cursor:
-            _guild_hid = await self.client.database.get_guild_rid(
-                cursor,
+        async with self.client.unit_of_work("command.stop") as unit:
+            _guild_hid = await self.client.guild_cache.guild_rid(
+                unit.cursor,
                 guild_id=interaction.guild.id
             )
+            language = await self.client.guild_cache.language(
+                unit.cursor,
+                guild_rid=_guild_hid
+            )
 
-            if not (await poll.started(cursor)):
-                return await interaction.response.send_message(
-                    content=await self.client.translator.translate(
-                        cursor,
-                        guild_rid=_guild_hid,
-                        key="poll.stop.not_started",
-                        id=poll.hid
-                    ),
-                    ephemeral=True
+            snapshot = None
+            if not (await poll.started(unit.cursor)):
+                content = self.client.translator.translate_sync(
+                    language,
+                    key="poll.stop.not_started",
+                    id=poll.hid
                 )
 
-            await poll.stop(cursor)
-            self.client.manager.set_poll(poll)
+            else:
+                snapshot = await poll.stop(unit.cursor)
 
-            await interaction.response.send_message(
-                content=await self.client.translator.translate(
-                    cursor,
-                    guild_rid=_guild_hid,
+                content = self.client.translator.translate_sync(
+                    language,
                     key="poll.stop.success",
                     id=poll.hid
-                ),
-                ephemeral=True
-            )
+                )
+
+        if snapshot is not None:
+            # the poll is deleted, nothing may accept votes for it even if the response below fails
+            poll.forget()
+
+        await interaction.response.send_message(
+            content=content,
+            ephemeral=True
+        )
+        if snapshot is not None:
+            await poll.show_stopped(snapshot)
 
     @app_commands.command(
         name="stats",
@@ -245,55 +308,72 @@ class Main(BetterCog):
             interaction: BetterInteraction,
             poll: POLL_TRANSFORMER
     ):
-        async with self.client.pool.acquire() as cursor:
-            total_votes = await poll.total_votes(cursor)
-            _labels = await self.client.database.poll_options(
-                cursor,
-                poll_rid=poll.rid
+        async with self.client.acquire("command.stats") as cursor:
+            snapshot = await poll.snapshot(cursor)
+
+        labels = [option.name for option in snapshot.options]
+        counts = [option.vote_count for option in snapshot.options]
+
+        total_votes = snapshot.total_votes
+        legend = render_options(snapshot.options, total_votes)
+
+        key = ChartCache.key(self.client.charts.backend, snapshot.rid, labels, counts, snapshot.language)
+        png = await self.client.chart_cache.get(key)
+        if png is not None:
+            return await interaction.response.send_message(
+                content=legend,
+                file=discord.File(io.BytesIO(png), filename="stats.png"),
+                ephemeral=True
             )
-            labels = [
-                await self.client.database.poll_option_name(
-                    cursor,
-                    option_rid=_option_hid
-                ) for _option_hid in _labels
-            ]
 
-            sizes = [
-                round(await self.client.database.option_vote_count(
-                    cursor,
-                    option_rid=option_hid
-                ) / total_votes, 2) if total_votes >= 1 else 0.00 for option_hid in _labels
-            ]
+        if self.client.charts.saturated:
+            return await interaction.response.send_message(
+                content=self.client.translator.translate_sync(
+                    snapshot.language,
+                    key="poll.stats.busy"
+                ),
+                ephemeral=True
+            )
 
-        fig1, ax1 = plt.subplots()
-        ax1.pie(sizes, labels=labels, autopct='%1.1f%%', shadow=True, startangle=90)
-        ax1.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
+        await interaction.response.defer(ephemeral=True, thinking=True)
 
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png")
-        plt.close()
-        buf.seek(0)
+        sizes = [
+            round(count / total_votes, 2) if total_votes >= 1 else 0.00 for count in counts
+        ]
 
-        file = discord.File(buf, filename="stats.png")
-        buf.close()
+        try:
+            png = await self.client.charts.render(labels, sizes)
 
-        await interaction.response.send_message(
-            file=file,
+        except ChartPoolBusy:
+            return await interaction.followup.send(
+                content=self.client.translator.translate_sync(
+                    snapshot.language,
+                    key="poll.stats.busy"
+                ),
+                ephemeral=True
+            )
+
+        await self.client.chart_cache.put(key, png)
+        await interaction.followup.send(
+            content=legend,
+            file=discord.File(io.BytesIO(png), filename="stats.png"),
             ephemeral=True
         )
 
-        file.close()
-
     @app_commands.command(
         name="list",
         description="List all your polls"
     )
     async def list(self, interaction: BetterInteraction):
-        async with self.client.pool.acquire() as cursor:
-            _guild_hid = await self.client.database.get_guild_rid(
+        async with self.client.acquire("command.list") as cursor:
+            _guild_hid = await self.client.guild_cache.guild_rid(
                 cursor,
                 guild_id=interaction.guild.id
             )
+            language = await self.client.guild_cache.language(
+                cursor,
+                guild_rid=_guild_hid
+            )
 
             poll_data = []
             _polls = await self.client.database.guild_poll_ids(
@@ -302,9 +382,8 @@ class Main(BetterCog):
             )
 
             embed = discord.Embed(
-                title=await self.client.translator.translate(
-                    cursor,
-                    guild_rid=_guild_hid,
+                title=self.client.translator.translate_sync(
+                    language,
                     key="poll.list.title"
                 )
             )
@@ -319,9 +398,9 @@ class Main(BetterCog):
 
             embed.description = "\n".join(poll_data)
 
-            await interaction.response.send_message(
-                embed=embed
-            )
+        await interaction.response.send_message(
+            embed=embed
+        )
 
     group = app_commands.Group(
         name="settings",
@@ -340,25 +419,26 @@ class Main(BetterCog):
             interaction: BetterInteraction,
             language: LANGUAGE_TRANSFORMER
     ):
-        async with self.client.pool.acquire() as cursor:
-            _guild_hid = await self.client.database.get_guild_rid(
-                cursor,
+        async with self.client.unit_of_work("command.settings_language") as unit:
+            _guild_hid = await self.client.guild_cache.guild_rid(
+                unit.cursor,
                 guild_id=interaction.guild.id
             )
-            await self.client.database.set_guild_language(
-                cursor,
+            await unit.database.set_guild_language(
                 guild_rid=_guild_hid,
                 language=language
             )
 
-            return await interaction.response.send_message(
-                content=await self.client.translator.translate(
-                    cursor,
-                    guild_rid=_guild_hid,
-                    key="settings.set_language.success",
-                    language=language
-                )
+        # only drop the cached language once the new one is committed
+        self.client.guild_cache.invalidate(_guild_hid)
+
+        return await interaction.response.send_message(
+            content=self.client.translator.translate_sync(
+                language,
+                key="settings.set_language.success",
+                language=language
             )
+        )
 
 
 async def setup(client: BetterBot):
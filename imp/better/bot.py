@@ -1,34 +1,79 @@
-from asyncpg import Pool, create_pool
+from __future__ import annotations
+
+from typing import Optional
+
+from aiohttp import web
+from asyncpg import Pool, connect, create_pool
 from discord.ext.commands import Bot
+from discord.webhook.async_ import async_context
 from hashids import Hashids
 
+from imp.better.hashids import BetterHashids
 from imp.better.logger import BetterLogger
-from imp.classes import PollManager
-from imp.database import database
+from imp.better.metrics import METRICS, serve_prometheus
+from imp import charts, classes
+from imp.database import database, migrations, pool, statements, unit
 from imp.translation.translator import Translator
+from imp.views import dispatcher
 
 
 class BetterBot(Bot, BetterLogger):
     pool: Pool
+    pool_guard: pool.PoolGuard
     config: dict
     database: database.Database
     translator: Translator
-    manager: PollManager
-    guild_hashids: Hashids
-    poll_hashids: Hashids
-    option_hashids: Hashids
-    vote_hashids: Hashids
+    renderer: classes.PollRenderer
+    manager: classes.PollManager
+    guild_cache: classes.GuildCache
+    scheduler: classes.EmbedUpdateScheduler
+    ingest: classes.VoteIngestQueue
+    autocomplete: classes.AutocompleteIndex
+    poll_dispatcher: dispatcher.PollDispatcher
+    charts: charts.ChartPool
+    chart_cache: charts.ChartCache
+    metrics_server: Optional[web.AppRunner]
+    guild_hashids: BetterHashids
+    poll_hashids: BetterHashids
+    option_hashids: BetterHashids
+    vote_hashids: BetterHashids
+
+    async def init_migrations(self):
+        # on a connection of its own before the pool exists, the pool prepares every statement on each connection
+        options = {key: value for key, value in self.config["database"].items() if key not in pool.SIZING}
+        connection = await connect(**options)
+        try:
+            await migrations.Migrator().migrate(connection)
+
+        finally:
+            await connection.close()
 
     async def init_pool(self):
+        options = self.config.get("pool", {})
+        sizing = {key: options[key] for key in pool.SIZING if key in options}
+
+        self.pool_guard = pool.PoolGuard(
+            budget=options.get("budget", 1.0),
+            budgets=options.get("budgets", {}),
+            strict=options.get("strict", False)
+        )
+        self.pool_guard.watch(self.http, async_context.get())
+
         self.pool = await create_pool(
-            **self.config["database"]
+            **{**self.config["database"], **sizing},
+            connection_class=statements.StatementConnection,
+            init=database.STATEMENTS.prepare_all
         )
 
+    def acquire(self, callsite: str) -> pool.Lease:
+        # pool.acquire() with wait/hold metrics and the guard against holding a connection over discord calls
+        return self.pool_guard.acquire(self.pool, callsite)
+
     async def init_hash_ids(self):
-        self.guild_hashids = Hashids(**self.config["guild_hash_ids"])
-        self.poll_hashids = Hashids(**self.config["poll_hash_ids"])
-        self.option_hashids = Hashids(**self.config["option_hash_ids"])
-        self.vote_hashids = Hashids(**self.config["vote_hash_ids"])
+        self.guild_hashids = BetterHashids(Hashids(**self.config["guild_hash_ids"]))
+        self.poll_hashids = BetterHashids(Hashids(**self.config["poll_hash_ids"]))
+        self.option_hashids = BetterHashids(Hashids(**self.config["option_hash_ids"]))
+        self.vote_hashids = BetterHashids(Hashids(**self.config["vote_hash_ids"]))
 
     async def init_database(self):
         self.database = database.Database(
@@ -38,8 +83,76 @@ class BetterBot(Bot, BetterLogger):
             self.vote_hashids
         )
 
+    def unit_of_work(self, callsite: str, readonly: bool = False) -> unit.UnitOfWork:
+        return unit.UnitOfWork(self.acquire(callsite), self.database, readonly=readonly)
+
+    async def init_guild_cache(self):
+        self.guild_cache = classes.GuildCache(self)
+
     async def init_translator(self):
         self.translator = await Translator.load(self, "imp/translation/data")
 
+    async def init_renderer(self):
+        self.renderer = classes.PollRenderer(self.translator)
+
     async def init_manager(self):
-        self.manager = PollManager(self)
+        self.manager = classes.PollManager(self)
+
+    async def init_scheduler(self):
+        self.scheduler = classes.EmbedUpdateScheduler(self)
+        self.scheduler.start()
+
+    async def init_ingest(self):
+        self.ingest = classes.VoteIngestQueue(self, **self.config.get("vote_ingest", {}))
+        self.ingest.start()
+
+    async def init_autocomplete(self):
+        self.autocomplete = classes.AutocompleteIndex(self)
+
+    async def init_dispatcher(self):
+        self.poll_dispatcher = dispatcher.PollDispatcher(self)
+
+    async def init_charts(self):
+        self.charts = charts.ChartPool(**self.config.get("charts", {}))
+        await self.charts.start()
+        self.chart_cache = charts.ChartCache(**self.config.get("chart_cache", {}))
+
+    async def init_metrics(self):
+        config = self.config.get("metrics", {})
+        METRICS.enabled = config.get("enabled", False)
+        self.metrics_server = None
+
+        if not METRICS.enabled:
+            return
+
+        METRICS.instrument(self.database, "db")
+        METRICS.instrument(self.translator, "translate", ("translate", "translate_sync"))
+
+        METRICS.gauge("ingest.depth", lambda: len(self.ingest))
+        METRICS.gauge("ingest.last_flush_seconds", lambda: self.ingest.last_flush_latency)
+        METRICS.gauge("statements.prepares", lambda: database.STATEMENTS.prepares)
+        METRICS.gauge("statements.executions", lambda: database.STATEMENTS.executions)
+        METRICS.gauge("polls.pinned", lambda: len(self.manager.pinned))
+        METRICS.gauge("polls.cached", lambda: len(self.manager.polls))
+        METRICS.gauge("pool.size", self.pool.get_size)
+        METRICS.gauge("pool.in_use", lambda: self.pool.get_size() - self.pool.get_idle_size())
+        METRICS.gauge("pool.waiting", lambda: self.pool_guard.waiting)
+
+        if config.get("port") is not None:
+            # local only by default, the endpoint has no authentication
+            self.metrics_server = await serve_prometheus(config.get("host", "127.0.0.1"), config["port"])
+
+    async def close(self) -> None:
+        if getattr(self, "metrics_server", None) is not None:
+            await self.metrics_server.cleanup()
+
+        if hasattr(self, "charts"):
+            self.charts.stop()
+
+        if hasattr(self, "scheduler"):
+            self.scheduler.stop()
+
+        if hasattr(self, "ingest"):
+            await self.ingest.stop()
+
+        await super().close()
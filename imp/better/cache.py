@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    def __init__(
+            self,
+            maxsize: int,
+            ttl: Optional[float] = None,
+            on_evict: Optional[Callable[[K, V], None]] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry: Tuple[V, float]) -> bool:
+        return self.ttl is not None and entry[1] < time.monotonic()
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        if self._expired(entry):
+            self._evict(key, self._data.pop(key))
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: K, value: V):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+
+        self._data[key] = (value, expires)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._evict(*self._data.popitem(last=False))
+
+    def _evict(self, key: K, entry: Tuple[V, float]):
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key, entry[0])
+
+    def purge(self):
+        if self.ttl is None:
+            return
+
+        now = time.monotonic()
+        for key in [key for key, (_, expires) in self._data.items() if expires < now]:
+            self._evict(key, self._data.pop(key))
+
+    def values(self) -> Iterator[V]:
+        return (value for value, _ in self._data.values())
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        self._data.clear()
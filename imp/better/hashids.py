@@ -1,9 +1,49 @@
+from typing import Dict, Iterable, List, Tuple
+
 from hashids import Hashids
 
+from imp.better.cache import LRUCache
+
 
 class BetterHashids:
-    def __init__(self, hashids: Hashids):
+    CACHE_SIZE = 50_000
+
+    def __init__(self, hashids: Hashids, cache_size: int = CACHE_SIZE):
         self.hashids = hashids
+        # both directions are filled from either side, an id that was encoded once decodes without hashids
+        self._encoded: LRUCache[int, str] = LRUCache(cache_size)
+        self._decoded: LRUCache[str, Tuple[int, ...]] = LRUCache(cache_size)
 
     def encode(self, value: int) -> str:
-        return self.hashids.encode(value)
+        hid = self._encoded.get(value)
+
+        if hid is None:
+            hid = self.hashids.encode(value)
+            self._encoded.set(value, hid)
+            self._decoded.set(hid, (value,))
+
+        return hid
+
+    def encode_many(self, values: Iterable[int]) -> List[str]:
+        return [self.encode(value) for value in values]
+
+    def decode(self, hid: str) -> Tuple[int, ...]:
+        values = self._decoded.get(hid)
+
+        if values is None:
+            values = self.hashids.decode(hid)
+
+            # invalid input (e.g. half typed autocomplete values) is not worth a cache slot
+            if len(values) == 1:
+                self._decoded.set(hid, values)
+                self._encoded.set(values[0], hid)
+
+        return values
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "encode_hits": self._encoded.hits,
+            "encode_misses": self._encoded.misses,
+            "decode_hits": self._decoded.hits,
+            "decode_misses": self._decoded.misses
+        }
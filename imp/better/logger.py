@@ -1,14 +1,81 @@
+import atexit
+import json
+import logging
+import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import IO, Optional
 
 from imp.data.colors import Colors
 
+logger = logging.getLogger("pollz")
+_listener: Optional[QueueListener] = None
 
-class BetterLogger:
-    def log(self, agent: str, message: str, color: str = Colors.GREEN):
-        print(
-            "%s%s[%s%s%s%s%s]%s %s[%s%s%s%s@%s%s%s%s]%s ~ %s%s%s" % (
-                Colors.E, Colors.BOLD, Colors.E, Colors.B, datetime.now(), Colors.E, Colors.BOLD, Colors.E,
-                Colors.BOLD, Colors.E, Colors.C, agent, Colors.E, Colors.C, self.__class__.__name__, Colors.E,
-                Colors.BOLD, Colors.E, color, message, Colors.E
-            )
+
+class ColorFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return "%s%s[%s%s%s%s%s]%s %s[%s%s%s%s@%s%s%s%s]%s ~ %s%s%s" % (
+            Colors.E, Colors.BOLD, Colors.E, Colors.B, datetime.fromtimestamp(record.created), Colors.E, Colors.BOLD,
+            Colors.E, Colors.BOLD, Colors.E, Colors.C, record.agent, Colors.E, Colors.C, record.owner, Colors.E,
+            Colors.BOLD, Colors.E, record.color, record.getMessage(), Colors.E
         )
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            "time": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "agent": record.agent,
+            "owner": record.owner,
+            "message": record.getMessage()
+        })
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the listener is a thread of this process, so the record can be handed over as is and
+        # merging the message args is left to the listener as well
+        return record
+
+
+def start_logging(level: str = "INFO", json_lines: bool = False, stream: IO[str] = sys.stdout):
+    global _listener
+    stop_logging()
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter() if json_lines else ColorFormatter())
+
+    # the event loop only puts records on the queue, formatting and writing happen on the listener thread
+    queue: SimpleQueue = SimpleQueue()
+    logger.handlers = [_QueueHandler(queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = QueueListener(queue, handler)
+    _listener.start()
+
+
+def stop_logging():
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+class BetterLogger:
+    def log(self, agent: str, message: str, color: str = Colors.GREEN, *args, level: int = logging.INFO):
+        # nothing is formatted for disabled levels; pass values as args instead of an f-string to keep it that way
+        if not logger.isEnabledFor(level):
+            return
+
+        # makeRecord + handle skips logging's caller lookup, which walks the stack on every call
+        logger.handle(logger.makeRecord(
+            logger.name, level, "", 0, message, args, None,
+            extra={"agent": agent, "owner": self.__class__.__name__, "color": color}
+        ))
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from aiohttp import web
+
+# seconds; roughly 2x apart from 0.5ms to 30s, which covers a prepared statement up to a rate limited edit
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        # the last slot counts everything above the largest bucket
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = BUCKETS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+                # linear inside the bucket, the same estimate Prometheus' histogram_quantile makes
+                return lower + (upper - lower) * (rank - seen) / count
+
+            seen += count
+
+        return BUCKETS[-1]
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+NO_TIMER = _NoTimer()
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, Callable[[], float]] = {}
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+
+        return histogram
+
+    def observe(self, name: str, seconds: float):
+        if self.enabled:
+            self.histogram(name).observe(seconds)
+
+    def count(self, name: str, value: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name: str, callback: Callable[[], float]):
+        self.gauges[name] = callback
+
+    def timer(self, name: str):
+        # disabled metrics hand out one shared no-op context, so timed blocks cost a call and an attribute check
+        return _Timer(self.histogram(name)) if self.enabled else NO_TIMER
+
+    def timed(self, name: str, function: Callable) -> Callable:
+        histogram = self.histogram(name)
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    def instrument(self, target: Any, prefix: str, names: Optional[Iterable[str]] = None):
+        # wraps on the instance, nothing is wrapped (and nothing costs anything) while metrics are disabled
+        if not self.enabled:
+            return
+
+        if names is None:
+            names = [
+                name for name, value in inspect.getmembers(type(target), inspect.iscoroutinefunction)
+                if not name.startswith("_")
+            ]
+
+        for name in names:
+            setattr(target, name, self.timed(f"{prefix}.{name}", getattr(target, name)))
+
+    def summary(self) -> List[Tuple[str, int, float, float, float]]:
+        return sorted(
+            (
+                (name, histogram.count, histogram.quantile(0.5), histogram.quantile(0.95), histogram.quantile(0.99))
+                for name, histogram in self.histograms.items() if histogram.count
+            ),
+            key=lambda row: row[1] * row[2],
+            reverse=True
+        )
+
+    def prometheus(self) -> str:
+        lines: List[str] = []
+
+        typed = set()
+        for name, histogram in sorted(self.histograms.items()):
+            if not histogram.count:
+                continue
+
+            # "db.poll_snapshot" -> pollz_db_seconds{name="poll_snapshot"}
+            group, _, label = name.partition(".")
+            metric = f"pollz_{group}_seconds"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+
+            cumulative = 0
+            for bucket, count in zip(BUCKETS + ("+Inf",), histogram.counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{{name=\"{label}\",le=\"{bucket}\"}} {cumulative}")
+
+            lines.append(f"{metric}_sum{{name=\"{label}\"}} {histogram.sum}")
+            lines.append(f"{metric}_count{{name=\"{label}\"}} {histogram.count}")
+
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE pollz_{name.replace('.', '_')}_total counter")
+            lines.append(f"pollz_{name.replace('.', '_')}_total {value}")
+
+        for name, callback in sorted(self.gauges.items()):
+            lines.append(f"# TYPE pollz_{name.replace('.', '_')} gauge")
+            lines.append(f"pollz_{name.replace('.', '_')} {callback()}")
+
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+async def serve_prometheus(host: str, port: int) -> web.AppRunner:
+    async def handle(_: web.Request) -> web.Response:
+        return web.Response(text=METRICS.prometheus(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
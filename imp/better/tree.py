@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from discord import InteractionType, app_commands
+
+from imp.better.metrics import METRICS
+
+if TYPE_CHECKING:
+    from imp.better.interaction import BetterInteraction
+
+
+class BetterTree(app_commands.CommandTree):
+    @staticmethod
+    def command_name(interaction: BetterInteraction) -> str:
+        # "settings language" for subcommands, options of type 1 and 2 are subcommands and groups
+        data = interaction.data or {}
+        parts = [data.get("name", "unknown")]
+
+        options = data.get("options", [])
+        while options and options[0].get("type") in (1, 2):
+            parts.append(options[0]["name"])
+            options = options[0].get("options", [])
+
+        return "_".join(parts)
+
+    async def _call(self, interaction: BetterInteraction) -> None:
+        if not METRICS.enabled:
+            return await super()._call(interaction)
+
+        # autocomplete requests are routed through here as well, one per keystroke
+        kind = "autocomplete" if interaction.type is InteractionType.autocomplete else "command"
+        with METRICS.timer(f"{kind}.{self.command_name(interaction)}"):
+            await super()._call(interaction)
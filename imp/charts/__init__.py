@@ -0,0 +1,2 @@
+from imp.charts.pool import ChartPool
+from imp.charts.cache import ChartCache
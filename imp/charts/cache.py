@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import aiofiles
+import aiofiles.os
+
+from imp.better.logger import BetterLogger
+from imp.data.colors import Colors
+
+
+class ChartCache(BetterLogger):
+    MAX_BYTES = 32 * 1024 * 1024
+    MAX_SPILL_BYTES = 256 * 1024 * 1024
+
+    def __init__(
+            self,
+            max_bytes: int = MAX_BYTES,
+            spill_directory: Optional[str] = None,
+            max_spill_bytes: int = MAX_SPILL_BYTES
+    ):
+        self.max_bytes = max_bytes
+        self.spill_directory = spill_directory
+        self.max_spill_bytes = max_spill_bytes
+
+        self._data: OrderedDict[str, bytes] = OrderedDict()
+        self._spilled: OrderedDict[str, int] = OrderedDict()
+        self.bytes = 0
+        self.spill_bytes = 0
+
+        self.hits = 0
+        self.spill_hits = 0
+        self.misses = 0
+
+        if spill_directory is not None:
+            os.makedirs(spill_directory, exist_ok=True)
+
+            # charts spilled by a previous run are still valid, they are addressed by their content
+            for entry in sorted(os.scandir(spill_directory), key=lambda entry: entry.stat().st_mtime):
+                if entry.is_file() and entry.name.endswith(".png"):
+                    self._spilled[entry.name[:-4]] = entry.stat().st_size
+                    self.spill_bytes += entry.stat().st_size
+
+    @staticmethod
+    def key(kind: str, poll_rid: int, names: Iterable[str], counts: Iterable[int], locale: Optional[str]) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{kind}\0{poll_rid}\0{locale}\0".encode())
+
+        for name, count in zip(names, counts):
+            digest.update(f"{name}\0{count}\0".encode())
+
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.spill_directory, key + ".png")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        png = self._data.get(key)
+        if png is not None:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return png
+
+        if key in self._spilled:
+            try:
+                async with aiofiles.open(self._path(key), "rb") as f:
+                    png = await f.read()
+
+            except OSError:
+                self.spill_bytes -= self._spilled.pop(key)
+
+            else:
+                self.spill_hits += 1
+                await self.put(key, png)
+                return png
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, png: bytes):
+        if key in self._data:
+            self._data.move_to_end(key)
+            return
+
+        self._data[key] = png
+        self.bytes += len(png)
+
+        while self.bytes > self.max_bytes and self._data:
+            evicted_key, evicted = self._data.popitem(last=False)
+            self.bytes -= len(evicted)
+
+            if self.spill_directory is not None:
+                await self._spill(evicted_key, evicted)
+
+    async def _spill(self, key: str, png: bytes):
+        if key in self._spilled:
+            self._spilled.move_to_end(key)
+            return
+
+        try:
+            async with aiofiles.open(self._path(key), "wb") as f:
+                await f.write(png)
+
+        except OSError as e:
+            self.log("spill", "Could not spill %s: %r", Colors.YELLOW, key, e, level=logging.WARNING)
+            return
+
+        self._spilled[key] = len(png)
+        self.spill_bytes += len(png)
+
+        while self.spill_bytes > self.max_spill_bytes and self._spilled:
+            evicted_key, size = self._spilled.popitem(last=False)
+            self.spill_bytes -= size
+
+            try:
+                await aiofiles.os.remove(self._path(evicted_key))
+
+            except OSError:
+                pass
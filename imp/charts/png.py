@@ -0,0 +1,72 @@
+import struct
+import zlib
+from typing import Iterable, List, Sequence, Tuple
+
+RGB = Tuple[int, int, int]
+
+BACKGROUND: RGB = (0x2f, 0x31, 0x36)
+EMPTY: RGB = (0x20, 0x22, 0x25)
+# same order and colours as Emojis.emojis, so the bars match the poll message
+COLORS: List[RGB] = [
+    (0xdd, 0x2e, 0x44),
+    (0x55, 0xac, 0xee),
+    (0x78, 0xb1, 0x59),
+    (0xf4, 0x90, 0x0c),
+    (0xaa, 0x8e, 0xd6),
+    (0xfd, 0xcb, 0x58),
+    (0xc1, 0x69, 0x4f),
+    (0xe6, 0xe7, 0xe8),
+]
+
+WIDTH = 480
+PADDING = 16
+BAR_HEIGHT = 24
+BAR_GAP = 8
+
+
+def _chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+
+def encode_png(width: int, height: int, rows: Iterable[bytes]) -> bytes:
+    # 8 bit RGB, every scanline prefixed with filter type 0
+    raw = b"".join(b"\x00" + row for row in rows)
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + _chunk(b"IDAT", zlib.compress(raw, 6))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def _row(segments: Sequence[Tuple[RGB, int]], width: int) -> bytes:
+    row = b"".join(bytes(color) * length for color, length in segments)
+    return row + bytes(BACKGROUND) * (width - len(row) // 3)
+
+
+def render_bars(sizes: Sequence[float]) -> bytes:
+    inner = WIDTH - 2 * PADDING
+    margin = bytes(BACKGROUND) * PADDING
+
+    # the sizes are rounded, together they can come to more than 1 (6 x 0.17), so the last segments are clamped
+    stacked = []
+    remaining = inner
+    for i, size in enumerate(sizes):
+        length = min(int(size * inner), remaining)
+        stacked.append((COLORS[i], length))
+        remaining -= length
+    stacked.append((EMPTY, remaining))
+
+    bars = [[(COLORS[i], int(size * inner)), (EMPTY, inner - int(size * inner))] for i, size in enumerate(sizes)]
+
+    blank = _row((), WIDTH)
+    rows: List[bytes] = [blank] * PADDING
+    rows.extend([margin + _row(stacked, inner + PADDING)] * BAR_HEIGHT)
+
+    for bar in bars:
+        rows.extend([blank] * BAR_GAP)
+        rows.extend([margin + _row(bar, inner + PADDING)] * BAR_HEIGHT)
+
+    rows.extend([blank] * PADDING)
+    return encode_png(WIDTH, len(rows), rows)
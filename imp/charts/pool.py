@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from imp.better.logger import BetterLogger
+from imp.charts import render
+from imp.errors import ChartPoolBusy
+
+
+class ChartPool(BetterLogger):
+    BACKEND = "builtin"
+    WORKERS = 2
+    MAX_PENDING = 8
+
+    def __init__(self, backend: str = BACKEND, workers: int = WORKERS, max_pending: int = MAX_PENDING):
+        if backend not in render.BACKENDS:
+            raise ValueError(f"Unknown chart backend {backend!r}")
+
+        self.backend = backend
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def saturated(self) -> bool:
+        return self.pending >= self.max_pending
+
+    async def start(self):
+        if self.backend not in render.PROCESS_BACKENDS:
+            # rendered on the default thread executor, nothing to import up front
+            self.log("start", f"Using the {self.backend} chart backend")
+            return
+
+        # spawn instead of fork, forking the running bot would copy its event loop and sockets
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=render.warm,
+            initargs=(self.backend,)
+        )
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, render.warm, self.backend) for _ in range(self.workers)
+        ))
+        self.log("start", f"{self.workers} {self.backend} chart workers ready")
+
+    def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, labels: List[str], sizes: List[float]) -> bytes:
+        if self.saturated:
+            raise ChartPoolBusy("All chart workers are busy")
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                functools.partial(render.BACKENDS[self.backend], labels, sizes)
+            )
+
+        finally:
+            self.pending -= 1
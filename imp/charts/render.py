@@ -0,0 +1,44 @@
+import io
+from typing import Callable, Dict, List
+
+# everything in here may run inside the chart worker processes
+
+
+def warm(backend: str):
+    if backend == "matplotlib":
+        import matplotlib
+        matplotlib.use("Agg")
+
+        from matplotlib.figure import Figure  # noqa: F401
+        from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: F401
+
+
+def render_builtin(labels: List[str], sizes: List[float]) -> bytes:
+    from imp.charts.png import render_bars
+
+    return render_bars(sizes)
+
+
+def render_matplotlib(labels: List[str], sizes: List[float]) -> bytes:
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    # a standalone Figure keeps away from pyplot's global state
+    figure = Figure()
+    FigureCanvasAgg(figure)
+
+    axes = figure.subplots()
+    axes.pie(sizes, labels=labels, autopct='%1.1f%%', shadow=True, startangle=90)
+    axes.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
+
+    buf = io.BytesIO()
+    figure.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+BACKENDS: Dict[str, Callable[[List[str], List[float]], bytes]] = {
+    "builtin": render_builtin,
+    "matplotlib": render_matplotlib
+}
+# backends that hold the GIL for long or keep global state get their own processes
+PROCESS_BACKENDS = {"matplotlib"}
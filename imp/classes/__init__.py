@@ -2,3 +2,10 @@ from imp.classes.poll import Poll
 from imp.classes.manager import PollManager
 from imp.classes.vote import PollVote
 from imp.classes.option import PollOption
+from imp.classes.snapshot import PollSnapshot, OptionSnapshot
+from imp.classes.scheduler import EmbedUpdateScheduler
+from imp.classes.guild import GuildCache
+from imp.classes.config import PollConfig
+from imp.classes.renderer import PollRenderer
+from imp.classes.ingest import VoteIngestQueue
+from imp.classes.autocomplete import AutocompleteIndex
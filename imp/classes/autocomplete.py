@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+from imp.classes.snapshot import PollSnapshot
+
+if TYPE_CHECKING:
+    from imp.better.bot import BetterBot
+
+# discord shows at most 25 autocomplete choices
+MAX_CHOICES = 25
+
+
+class PrefixIndex:
+    __slots__ = ("_keys", "_labels")
+
+    def __init__(self):
+        # (lowercased hid or name, rid), kept sorted so a prefix is one bisect and a short scan
+        self._keys: List[Tuple[str, int]] = []
+        self._labels: Dict[int, Tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def add(self, rid: int, hid: str, name: str):
+        self.remove(rid)
+        self._labels[rid] = (hid, name)
+
+        for key in {hid.lower(), name.lower()}:
+            insort(self._keys, (key, rid))
+
+    def remove(self, rid: int):
+        label = self._labels.pop(rid, None)
+        if label is None:
+            return
+
+        for key in {label[0].lower(), label[1].lower()}:
+            i = bisect_left(self._keys, (key, rid))
+            if i < len(self._keys) and self._keys[i] == (key, rid):
+                del self._keys[i]
+
+    def search(self, prefix: str, limit: int = MAX_CHOICES) -> List[Tuple[str, str]]:
+        prefix = prefix.lower()
+        found: Dict[int, None] = {}
+
+        # (prefix,) sorts before every (key, rid) that starts with prefix
+        for i in range(bisect_left(self._keys, (prefix,)), len(self._keys)):
+            key, rid = self._keys[i]
+            if not key.startswith(prefix) or len(found) >= limit:
+                break
+
+            found[rid] = None
+
+        return [self._labels[rid] for rid in found]
+
+
+class AutocompleteIndex:
+    def __init__(self, client: BetterBot):
+        self.client = client
+        self.guilds: Dict[int, PrefixIndex] = {}
+        self.polls: Dict[int, PrefixIndex] = {}
+        self.poll_guilds: Dict[int, int] = {}
+
+    def add_poll(self, guild_rid: int, poll_rid: int, title: str):
+        self.guilds.setdefault(guild_rid, PrefixIndex()).add(
+            poll_rid, self.client.poll_hashids.encode(poll_rid), title or ""
+        )
+        self.polls.setdefault(poll_rid, PrefixIndex())
+        self.poll_guilds[poll_rid] = guild_rid
+
+    def add_options(self, poll_rid: int, options: Iterable[Tuple[int, str]]):
+        index = self.polls.setdefault(poll_rid, PrefixIndex())
+        options = list(options)
+
+        for (option_rid, name), option_hid in zip(
+                options, self.client.option_hashids.encode_many(option_rid for option_rid, _ in options)
+        ):
+            index.add(option_rid, option_hid, name)
+
+    def add_snapshot(self, snapshot: PollSnapshot):
+        self.add_poll(snapshot.guild_rid, snapshot.rid, snapshot.title)
+        self.add_options(snapshot.rid, ((option.rid, option.name) for option in snapshot.options))
+
+    def remove_poll(self, poll_rid: int):
+        self.polls.pop(poll_rid, None)
+
+        guild_rid = self.poll_guilds.pop(poll_rid, None)
+        if guild_rid is not None and guild_rid in self.guilds:
+            self.guilds[guild_rid].remove(poll_rid)
+
+    def search_polls(self, guild_rid: int, prefix: str) -> List[Tuple[str, str]]:
+        index = self.guilds.get(guild_rid)
+        return index.search(prefix) if index is not None else []
+
+    def search_options(self, poll_rid: int, prefix: str) -> List[Tuple[str, str]]:
+        index = self.polls.get(poll_rid)
+        return index.search(prefix) if index is not None else []
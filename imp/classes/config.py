@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import NamedTuple, Optional
+
+from asyncpg import Record
+
+
+class PollConfig(NamedTuple):
+    guild_rid: int
+    channel_id: int
+    message_id: int
+    title: Optional[str]
+    description: Optional[str]
+
+    @classmethod
+    def from_record(cls, record: Record) -> PollConfig:
+        return cls(
+            guild_rid=record["guild"],
+            channel_id=record["channel"],
+            message_id=record["message"],
+            title=record["title"],
+            description=record["description"]
+        )
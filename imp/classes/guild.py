@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from asyncpg import Connection
+
+from imp.better.cache import LRUCache
+
+if TYPE_CHECKING:
+    from imp.better.bot import BetterBot
+
+
+class GuildCache:
+    MAX_GUILDS = 10000
+    TTL = 15 * 60
+
+    def __init__(self, client: BetterBot):
+        self.client = client
+        self.rids: LRUCache[int, int] = LRUCache(self.MAX_GUILDS, self.TTL)
+        self.languages: LRUCache[int, str] = LRUCache(self.MAX_GUILDS, self.TTL)
+
+    async def guild_rid(self, cursor: Connection, /, guild_id: int) -> Optional[int]:
+        guild_rid = self.rids.get(guild_id)
+        if guild_rid is not None:
+            return guild_rid
+
+        guild_rid = await self.client.database.get_guild_rid(
+            cursor,
+            guild_id=guild_id
+        )
+        if guild_rid is not None:
+            self.rids.set(guild_id, guild_rid)
+
+        return guild_rid
+
+    def known_language(self, guild_rid: int) -> Optional[str]:
+        return self.languages.get(guild_rid)
+
+    async def language(self, cursor: Connection, /, guild_rid: int) -> Optional[str]:
+        language = self.languages.get(guild_rid)
+        if language is not None:
+            return language
+
+        language = await self.client.database.guild_language(
+            cursor,
+            guild_rid=guild_rid
+        )
+        if language is not None:
+            self.languages.set(guild_rid, language)
+
+        return language
+
+    def invalidate(self, guild_rid: int):
+        self.languages.pop(guild_rid)
+
+    def invalidate_guild_id(self, guild_id: int):
+        guild_rid = self.rids.pop(guild_id)
+        if guild_rid is not None:
+            self.invalidate(guild_rid)
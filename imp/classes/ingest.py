@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Optional, Tuple
+
+from imp.better.logger import BetterLogger
+from imp.data.colors import Colors
+
+if TYPE_CHECKING:
+    from imp.better.bot import BetterBot
+
+# poll rid, option rid, user id
+VOTE = Tuple[int, int, int]
+
+
+class VoteIngestQueue(BetterLogger):
+    BATCH_SIZE = 5000
+    MAX_LATENCY = 2
+    MAX_DEPTH = 100_000
+
+    def __init__(
+            self,
+            client: BetterBot,
+            batch_size: int = BATCH_SIZE,
+            max_latency: float = MAX_LATENCY,
+            max_depth: int = MAX_DEPTH
+    ):
+        self.client = client
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.max_depth = max_depth
+
+        self._queue: Deque[VOTE] = deque()
+        self._full_batch = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.enqueued = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failures = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def full(self) -> bool:
+        return len(self._queue) >= self.max_depth
+
+    def put(self, poll_rid: int, option_rid: int, user: int) -> bool:
+        if self.full:
+            self.rejected += 1
+            return False
+
+        self._queue.append((poll_rid, option_rid, user))
+        self.enqueued += 1
+
+        if len(self._queue) >= self.batch_size:
+            self._full_batch.set()
+
+        return True
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            # wait for the loop to let go, a flush it was in the middle of puts its batch back first
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        while self._queue and await self.flush():
+            pass
+
+    async def flush(self) -> bool:
+        batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+        if not batch:
+            return False
+
+        start = time.perf_counter()
+        try:
+            async with self.client.acquire("ingest.flush") as cursor:
+                await self.client.database.merge_votes(
+                    cursor,
+                    votes=batch
+                )
+
+        except asyncio.CancelledError:
+            # stop() cancelled a running flush, the batch goes back for the final drain
+            self._queue.extendleft(reversed(batch))
+            raise
+
+        except Exception as e:
+            # keep the votes for the next flush; the unique constraints make re-sending a written batch harmless
+            self._queue.extendleft(reversed(batch))
+            self.failures += 1
+            self.log("flush", "Flushing %d votes failed: %r", Colors.RED, len(batch), e, level=logging.ERROR)
+            return False
+
+        self.last_flush_latency = time.perf_counter() - start
+        self.max_flush_latency = max(self.max_flush_latency, self.last_flush_latency)
+        self.flushed += len(batch)
+        self.flushes += 1
+        return True
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._full_batch.wait(), timeout=self.max_latency)
+            except asyncio.TimeoutError:
+                pass
+
+            self._full_batch.clear()
+            # a full batch flushes right away, otherwise whatever arrived within max_latency
+            while self._queue:
+                if not await self.flush():
+                    # back off instead of retrying against a failing database in a tight loop
+                    await asyncio.sleep(self.max_latency)
+                    break
+
+                if len(self._queue) < self.batch_size:
+                    break
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "depth": len(self._queue),
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "flushed": self.flushed,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "last_flush_latency": self.last_flush_latency,
+            "max_flush_latency": self.max_flush_latency
+        }
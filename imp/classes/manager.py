@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from imp.better.cache import LRUCache
 from imp.classes.poll import Poll
+from imp.classes.tally import VoteTally
 
 from typing import TYPE_CHECKING, Dict
 if TYPE_CHECKING:
@@ -8,23 +10,61 @@ if TYPE_CHECKING:
 
 
 class PollManager:
+    MAX_POLLS = 10000
+    POLL_TTL = 6 * 60 * 60
+
     def __init__(self, client: BetterBot):
         self.client = client
-        self.polls: Dict[int, Poll] = {}
+        # started polls with a live view stay resident, everything else is a bounded cache
+        self.pinned: Dict[int, Poll] = {}
+        self.polls: LRUCache[int, Poll] = LRUCache(self.MAX_POLLS, self.POLL_TTL)
+        self.tally = VoteTally(client)
+
+        self.hits = 0
+        self.misses = 0
 
     def init_poll(self, poll_rid: int) -> Poll:
         _poll = Poll(self.client, poll_rid)
-        self.polls[poll_rid] = _poll
+        self.set_poll(_poll)
         return _poll
 
     def get_poll(self, poll_rid: int) -> Poll:
-        _poll = self.polls.get(poll_rid)
+        _poll = self.pinned.get(poll_rid)
+
+        if _poll is None:
+            _poll = self.polls.get(poll_rid)
 
         if _poll is None:
+            self.misses += 1
             _poll = self.init_poll(poll_rid)
 
+        else:
+            self.hits += 1
+
         return _poll
 
     def set_poll(self, poll: Poll):
-        self.polls[poll.rid] = poll
+        if poll.pinned:
+            self.polls.pop(poll.rid)
+            self.pinned[poll.rid] = poll
+
+        else:
+            self.pinned.pop(poll.rid, None)
+            self.polls.set(poll.rid, poll)
+
+    def remove_poll(self, poll_rid: int):
+        self.pinned.pop(poll_rid, None)
+        self.polls.pop(poll_rid)
+
+    def stats(self) -> Dict[str, int]:
+        self.polls.purge()
 
+        return {
+            "entries": len(self.pinned) + len(self.polls),
+            "pinned": len(self.pinned),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.polls.evictions,
+            "bytes": sum(poll.approximate_size() for poll in self.pinned.values())
+            + sum(poll.approximate_size() for poll in self.polls.values())
+        }
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
 
 
 class PollOption:
+    __slots__ = ("poll", "_rid", "_hid", "_name")
 
     # noinspection PyTypeChecker
     def __init__(self, poll: "Poll", option_rid: int):
@@ -17,19 +18,25 @@ class PollOption:
         self._name: Optional[str] = None
 
     @classmethod
-    def from_data(cls, poll: "Poll", option_rid: int):
-        return cls(poll, option_rid)
+    def from_data(cls, poll: "Poll", option_rid: int, name: Optional[str] = None):
+        option = cls(poll, option_rid)
+        option._name = name
+        return option
 
     @property
     def rid(self) -> int:
         return self._rid
 
+    @property
+    def known_name(self) -> Optional[str]:
+        return self._name
+
     @property
     def hid(self) -> str:
         if self._hid is not None:
             return self._hid
 
-        self._hid = self.poll.client.option_hashids.encode(self._hid)
+        self._hid = self.poll.client.option_hashids.encode(self._rid)
         return self._hid
 
     async def name(self, cursor: Connection) -> str:
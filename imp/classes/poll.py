@@ -1,11 +1,15 @@
+from __future__ import annotations
+
+import sys
+
 import discord
 from asyncpg import Connection
-from datetime import datetime
 
+from imp.better.metrics import METRICS
+from imp.classes.config import PollConfig
 from imp.classes.option import PollOption
-from imp.classes.vote import PollVote
-from imp.database.database import Database
-from imp.emoji import Emojis
+from imp.classes.snapshot import PollSnapshot
+from imp.errors import PollException
 from imp.views.poll import PollView
 
 from typing import TYPE_CHECKING, Optional, List
@@ -15,27 +19,21 @@ if TYPE_CHECKING:
 
 # noinspection PyTypeChecker
 class Poll:
+    __slots__ = ("client", "_rid", "_hid", "_config", "_started", "view")
+
     GUILD_MAX_POLLS = 5
-    POLL_UPDATE_TIME = 10
     POLL_MAX_OPTIONS = 8
+    OPTION_SEPARATOR = ";"
 
     def __init__(self, client: BetterBot, poll_rid: int):
         self.client = client
         self._rid = poll_rid
         self._hid: Optional[str] = None
 
-        self._guild_rid: Optional[int] = None
-        self._guild_hid: Optional[str] = None
-        self._channel_id: Optional[int] = None
-        self._message_id: Optional[int] = None
-        self.view: Optional[PollView] = None
-        self._last_vote: Optional[datetime] = None
+        # everything stored in poll_config never changes, so it is loaded and cached as one record
+        self._config: Optional[PollConfig] = None
         self._started: Optional[bool] = None
-        self._title: Optional[str] = None
-        self._description: Optional[str] = None
-
-    def update_ready(self):
-        return (datetime.now()-self._last_vote).total_seconds() > self.POLL_UPDATE_TIME
+        self.view: Optional[PollView] = None
 
     @classmethod
     async def create(
@@ -47,7 +45,7 @@ class Poll:
             poll_title: Optional[str] = None,
             poll_description: Optional[str] = None
     ):
-        async with client.pool.acquire() as cursor:
+        async with client.acquire("poll.create") as cursor:
             poll_hid = await client.database.create_poll(
                 cursor,
                 guild_rid=_guild_hid,
@@ -59,12 +57,42 @@ class Poll:
 
             return cls(client, poll_hid)
 
-    def set_view(self, view: PollView):
+    def set_view(self, view: Optional[PollView]):
         self.view = view
 
+        if view is not None:
+            self.client.poll_dispatcher.remember(self.rid, view)
+
+        self.client.manager.set_poll(self)
+
+    @property
+    def pinned(self) -> bool:
+        return bool(self._started) and self.view is not None
+
+    def approximate_size(self) -> int:
+        size = sys.getsizeof(self)
+
+        if self._hid is not None:
+            size += sys.getsizeof(self._hid)
+
+        if self._config is not None:
+            size += sys.getsizeof(self._config) + sum(
+                sys.getsizeof(value) for value in self._config if value is not None
+            )
+
+        return size
+
     @property
     def rid(self) -> int:
-        return self.rid
+        return self._rid
+
+    @property
+    def known_channel_id(self) -> Optional[int]:
+        return self._config.channel_id if self._config is not None else None
+
+    @property
+    def known_guild_rid(self) -> Optional[int]:
+        return self._config.guild_rid if self._config is not None else None
 
     @property
     def hid(self) -> str:
@@ -74,35 +102,35 @@ class Poll:
         self._hid = self.client.poll_hashids.encode(self.rid)
         return self._hid
 
-    async def started(self, cursor: Connection) -> bool:
-        if self.started is not None:
-            return self.started
+    async def config(self, cursor: Connection) -> PollConfig:
+        if self._config is not None:
+            return self._config
 
-        self._started = await self.client.database.poll_started(
+        record = await self.client.database.poll_config(
             cursor,
             poll_rid=self.rid
         )
-        return self.started
+        if record is None:
+            raise PollException(f"A poll with the id `{self.hid}` does not exist!")
 
-    async def title(self, cursor: Connection) -> str:
-        if self._title is not None:
-            return self._title
+        self._config = PollConfig.from_record(record)
+        return self._config
+
+    async def started(self, cursor: Connection) -> bool:
+        if self._started is not None:
+            return self._started
 
-        self._title = await self.client.database.poll_title(
+        self._started = await self.client.database.poll_started(
             cursor,
             poll_rid=self.rid
         )
-        return self._title
+        return self._started
 
-    async def description(self, cursor: Connection) -> str:
-        if self._description is not None:
-            return self._description
+    async def title(self, cursor: Connection) -> str:
+        return (await self.config(cursor)).title
 
-        self._description = await self.client.database.poll_description(
-            cursor,
-            poll_rid=self.rid
-        )
-        return self._description
+    async def description(self, cursor: Connection) -> str:
+        return (await self.config(cursor)).description
 
     async def total_votes(self, cursor: Connection) -> int:
         return await self.client.database.poll_vote_count(
@@ -121,41 +149,24 @@ class Poll:
         ]
 
     async def guild_rid(self, cursor: Connection) -> int:
-        if self._guild_rid is not None:
-            return self._guild_rid
-
-        self._guild_rid = await self.client.database.poll_guild(
-            cursor,
-            poll_rid=self.rid
-        )
-        return self._guild_rid
-
-    async def guild_hid(self, cursor: Connection) -> int:
-        if self._guild_hid is not None:
-            return self._guild_hid
+        return (await self.config(cursor)).guild_rid
 
-        self._guild_hid = self.client.poll_hashids.encode(await self.guild_rid(cursor))
-        return self._guild_hid
+    async def guild_hid(self, cursor: Connection) -> str:
+        return self.client.guild_hashids.encode(await self.guild_rid(cursor))
 
     async def channel_id(self, cursor: Connection):
-        if self._channel_id is not None:
-            return self._channel_id
-
-        self._channel_id = await self.client.database.poll_channel_id(
-            cursor,
-            poll_rid=self.rid
-        )
-        return self._channel_id
+        return (await self.config(cursor)).channel_id
 
     async def message_id(self, cursor: Connection):
-        if self._message_id is not None:
-            return self._message_id
+        return (await self.config(cursor)).message_id
 
-        self._message_id = await self.client.database.poll_message_id(
-            cursor,
-            poll_rid=self.rid
+    async def message(self, cursor: Connection) -> discord.PartialMessage:
+        channel = self.client.get_partial_messageable(
+            await self.channel_id(cursor)
+        )
+        return channel.get_partial_message(
+            await self.message_id(cursor)
         )
-        return self._message_id
 
     async def exists(self, cursor: Connection) -> Optional[bool]:
         return await self.client.database.poll_exists(
@@ -163,93 +174,54 @@ class Poll:
             poll_rid=self.rid
         )
 
-    async def start(self, cursor: Connection):
+    async def start(self, cursor: Connection) -> PollSnapshot:
+        # database work only, the caller shows the result with show_started once the transaction committed
         await self.client.database.poll_start(
             cursor,
             poll_rid=self.rid
         )
-        channel = self.client.get_partial_messageable(
-            await self.channel_id(cursor)
-        )
-        message = channel.get_partial_message(
-            await self.message_id(cursor)
-        )
-        await message.edit(
-            view=await PollView(self).run(cursor)
-        )
-        await self.update(cursor)
+        return await self.snapshot(cursor)
 
-    async def stop(self, cursor: Connection):
-        await self.view.press_stop()
-        await self.client.database.poll_stop(
-            cursor,
-            poll_rid=self.rid
-        )
+    async def show_started(self, snapshot: PollSnapshot):
+        view = PollView(self).build(snapshot)
+        self.set_view(view)
+
+        message = self.client.get_partial_messageable(snapshot.channel_id).get_partial_message(snapshot.message_id)
+        with METRICS.timer("discord.message_edit"):
+            await message.edit(
+                view=view
+            )
+        await self.show(snapshot)
 
-        options = await self.options(cursor)
-        max_opt = await self.client.database.longest_poll_option_name(
+    async def stop(self, cursor: Connection) -> PollSnapshot:
+        # database work only, once the transaction committed the caller calls forget and then show_stopped
+        await self.client.database.poll_stop(
             cursor,
             poll_rid=self.rid
         )
-        total_votes = await self.total_votes(cursor)
-
-        _option_string = []
-        _color_string = ""
-        chars_used = 0
-        max_chars = 100
-
-        for i, opt in enumerate(options):
-            name = await opt.name(cursor)
-            vote_count = await opt.vote_count(cursor)
-            percentage = round(vote_count / total_votes, 4) if total_votes >= 1 else 0.0000
-
-            line = f"{Emojis.emojis[i]} **{name}**:{(max_opt - len(name)) * ' '} {percentage * 100}%"
-            _option_string.append(line)
+        snapshot = await self.snapshot(cursor)
+        await self.delete(cursor)
 
-            char_count = int(percentage*max_chars)
-            chars_used += char_count
-            _color_string += char_count * Emojis.emojis[i]
+        return snapshot
 
-        option_string = "\n".join(_option_string)
-        _color_string += (max_chars - chars_used) * Emojis.black
-        color_string = "\n".join([_color_string[i:i + 25] for i in range(0, len(_color_string), 25)])
+    async def show_stopped(self, snapshot: PollSnapshot):
+        if self.view is not None:
+            await self.view.press_stop()
 
-        poll_info = f"```\n{await self.description(cursor)}```"
-        poll_votes = f"**Total Votes**: {await self.total_votes(cursor)}"
+        rendered, _ = self.client.renderer.render(snapshot, self.hid, finished=True)
+        self.client.renderer.forget(self.rid)
 
-        guild_rid = await self.guild_rid(cursor)
-        title_translation = await self.client.translator.translate(
-            cursor,
-            guild_rid=guild_rid,
-            key="poll.title",
-            name=(await self.title(cursor)).upper()
-        )
-        stopped_translation = await self.client.translator.translate(
-            cursor,
-            guild_rid=guild_rid,
-            key="poll.finished"
-        )
         embed = discord.Embed(
-            title=title_translation,
-            description=f"{poll_info}\n{color_string}\n{stopped_translation}\n{poll_votes}\n{option_string}",
+            title=rendered.title,
+            description=rendered.description,
             colour=discord.Colour.red()
         )
-        embed.set_footer(
-            text=await self.client.translator.translate(
-                cursor,
-                guild_rid=guild_rid,
-                key="poll.footer",
-                id=self.rid
-            )
-        )
-        channel = self.client.get_partial_messageable(
-            await self.channel_id(cursor)
-        )
-        message = channel.get_partial_message(
-            await self.message_id(cursor)
-        )
-        await message.edit(embed=embed, view=self.view)
-        await self.delete(cursor)
+        embed.set_footer(text=rendered.footer)
+
+        channel = self.client.get_partial_messageable(snapshot.channel_id)
+        message = channel.get_partial_message(snapshot.message_id)
+        with METRICS.timer("discord.message_edit"):
+            await message.edit(embed=embed, view=self.view)
 
     async def delete(self, cursor: Connection):
         await self.client.database.poll_delete(
@@ -257,91 +229,130 @@ class Poll:
             poll_rid=self.rid
         )
 
-    async def add_option(self, cursor: Connection, name: str) -> Optional[int]:
-        return await self.client.database.create_poll_option(
+    def forget(self):
+        self.client.manager.tally.discard(self.rid)
+        self.client.scheduler.discard(self.rid)
+        self.client.poll_dispatcher.forget(self.rid)
+        self.client.manager.remove_poll(self.rid)
+        self.client.renderer.forget(self.rid)
+        self.client.autocomplete.remove_poll(self.rid)
+
+    async def add_options(self, cursor: Connection, names: List[str]) -> List[int]:
+        # usually inside the caller's transaction, the caller adds the options to the autocomplete index once it
+        # committed
+        return await self.client.database.create_poll_options(
             cursor,
             poll_rid=self.rid,
-            name=name
+            names=names
         )
 
+    @classmethod
+    def parse_options(cls, value: Optional[str]) -> List[str]:
+        if not value:
+            return []
+
+        return [name.strip() for name in value.split(cls.OPTION_SEPARATOR) if name.strip()]
+
+    def option(self, option_rid: int, name: Optional[str] = None) -> PollOption:
+        return PollOption.from_data(self, option_rid=option_rid, name=name)
+
     async def get_option(self, cursor: Connection, option_rid: int):
         return [i for i in await self.options(cursor) if i.rid == option_rid][0]
 
-    async def update(self, cursor: Connection):
-        options = await self.options(cursor)
-        max_opt = await self.client.database.longest_poll_option_name(
+    async def snapshot(self, cursor: Connection) -> PollSnapshot:
+        record = await self.client.database.poll_snapshot(
             cursor,
             poll_rid=self.rid
         )
-        total_votes = await self.total_votes(cursor)
+        if record is None:
+            raise PollException(f"A poll with the id `{self.hid}` does not exist!")
 
-        _option_string = []
-        _color_string = ""
-        chars_used = 0
-        max_chars = 100
+        snapshot = PollSnapshot.from_record(record)
+        # votes are written behind, so the in-memory tally is ahead of poll_votes
+        if self.client.manager.tally.loaded(self.rid):
+            snapshot = snapshot.with_counts(self.client.manager.tally.counts(self.rid))
 
-        for i, opt in enumerate(options):
-            name = await opt.name(cursor)
-            vote_count = await opt.vote_count(cursor)
-            percentage = round(vote_count/total_votes, 4) if total_votes >= 1 else 0.0000
+        self.apply_snapshot(snapshot)
+        return snapshot
 
-            line = f"{Emojis.emojis[i]} **{name}**:{(max_opt - len(name)) * ' '} {percentage * 100}%"
-            _option_string.append(line)
+    def apply_snapshot(self, snapshot: PollSnapshot):
+        self._config = snapshot.config
+        self._started = snapshot.started
 
-            char_count = int(percentage*max_chars)
-            chars_used += char_count
-            _color_string += char_count * Emojis.emojis[i]
-
-        option_string = "\n".join(_option_string)
-        _color_string += (max_chars-chars_used) * Emojis.black
-        color_string = "\n".join([_color_string[i:i+25] for i in range(0, len(_color_string), 25)])
+    async def update(self, cursor: Connection):
+        await self.show(await self.snapshot(cursor))
 
-        poll_info = f"```\n{await self.description(cursor)}```"
-        poll_votes = f"**Total Votes**: {await self.total_votes(cursor)}"
+    async def show(self, snapshot: PollSnapshot):
+        # needs no connection, so the edit (and discord's rate limit waits) run without holding one
+        rendered, changed = self.client.renderer.render(snapshot, self.hid)
+        if not changed:
+            return
 
-        guild_rid = await self.guild_rid(cursor)
-        title_translation = await self.client.translator.translate(
-            cursor,
-            guild_rid=guild_rid,
-            key="poll.title",
-            name=await self.title(cursor)
-        )
-        print(title_translation)
         embed = discord.Embed(
-            title=title_translation,
-            description=f"{poll_info}\n{color_string}\n{poll_votes}\n{option_string}",
-            colour=discord.Colour.green() if await self.started(cursor) else discord.Colour.yellow()
-        )
-        embed.set_footer(
-            text=await self.client.translator.translate(
-                cursor,
-                guild_rid=guild_rid,
-                key="poll.footer",
-                id=self.rid
-            )
+            title=rendered.title,
+            description=rendered.description,
+            colour=discord.Colour.green() if snapshot.started else discord.Colour.yellow()
         )
-        channel = self.client.get_partial_messageable(
-            await self.channel_id(cursor)
-        )
-        message = channel.get_partial_message(
-            await self.message_id(cursor)
-        )
-        await message.edit(embed=embed)
+        embed.set_footer(text=rendered.footer)
 
-    async def add_vote(self, cursor: Connection, vote: PollVote):
-        raise Exception(
-            "rewrite this as add_vote(cursor, option, user)"
-        )
+        channel = self.client.get_partial_messageable(snapshot.channel_id)
+        message = channel.get_partial_message(snapshot.message_id)
+        try:
+            with METRICS.timer("discord.message_edit"):
+                await message.edit(embed=embed)
+
+        except Exception:
+            # render again next time instead of assuming the message shows this output
+            self.client.renderer.forget(self.rid)
+            raise
 
-        self._last_vote = datetime.now()
-        _option_hid, *_ = Database.save_unpack(self.client.option_hashids.decode(vote.option))
+    def register_vote(self, option_rid: int, user: int) -> bool:
+        if not self.client.manager.tally.add(self.rid, option_rid, user):
+            return False
 
-        _vote_hid, = await cursor.fetchrow(
-            "INSERT INTO poll_votes(\"option\", \"user\") VALUES($1, $2) RETURNING \"id\"",
-            _option_hid, vote.user
+        self.client.scheduler.mark_dirty(self.rid)
+        return True
+
+    async def add_vote(self, cursor: Connection, option_rid: int, user: int) -> bool:
+        # (poll, user) is unique, so a second vote of the user is a conflict and inserts nothing
+        vote_rid = await self.client.database.insert_vote(
+            cursor,
+            poll_rid=self.rid,
+            option_rid=option_rid,
+            user_id=user
         )
-        vote_hid = self.client.vote_hashids.encode(_vote_hid)
-        return vote_hid
+
+        return vote_rid is not None
+
+    def vote_from_memory(self, option_rid: int, user: int) -> Optional[bool]:
+        # None when the vote has to be written directly, see vote
+        tally = self.client.manager.tally
+        if not tally.loaded(self.rid):
+            return None
+
+        if not self.client.ingest.full:
+            return self.register_vote(option_rid, user)
+
+        if tally.voted(self.rid, user):
+            return False
+
+        return None
+
+    async def vote(self, cursor: Connection, option_rid: int, user: int) -> bool:
+        voted = self.vote_from_memory(option_rid, user)
+        if voted is not None:
+            return voted
+
+        # polls that are not held in memory, or an ingest queue that is full, write the vote directly
+        if not await self.add_vote(cursor, option_rid, user):
+            return False
+
+        tally = self.client.manager.tally
+        if tally.loaded(self.rid):
+            tally.count(self.rid, option_rid, user)
+
+        self.client.scheduler.mark_dirty(self.rid)
+        return True
 
     async def user_voted(self, cursor: Connection, user: int):
         voted = await self.client.database.poll_user_voted(
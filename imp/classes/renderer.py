@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple, Sequence, Tuple
+
+from imp.better.cache import LRUCache
+from imp.classes.snapshot import OptionSnapshot, PollSnapshot
+from imp.emoji import Emojis
+
+if TYPE_CHECKING:
+    from imp.translation.translator import Translator
+
+
+BAR_CELLS = 100
+BAR_ROW = 25
+
+
+class RenderedPoll(NamedTuple):
+    title: str
+    description: str
+    footer: str
+
+
+def render_bar(counts: Sequence[int], total: int) -> str:
+    cells = []
+    if total >= 1:
+        for i, count in enumerate(counts):
+            cells.extend([Emojis.emojis[i]] * int(round(count / total, 4) * BAR_CELLS))
+
+    cells.extend([Emojis.black] * (BAR_CELLS - len(cells)))
+    return "\n".join("".join(cells[i:i + BAR_ROW]) for i in range(0, BAR_CELLS, BAR_ROW))
+
+
+def render_options(options: Sequence[OptionSnapshot], total: int) -> str:
+    longest = max((len(option.name) for option in options), default=0)
+
+    return "\n".join(
+        f"{Emojis.emojis[i]} **{option.name}**:{(longest - len(option.name)) * ' '} "
+        f"{round(option.vote_count / total * 100, 2) if total >= 1 else 0.0}%"
+        for i, option in enumerate(options)
+    )
+
+
+class PollRenderer:
+    CACHE_SIZE = 5000
+
+    def __init__(self, translator: Translator):
+        self.translator = translator
+        # poll rid -> (render key, output); the key holds everything the output depends on
+        self._cache: LRUCache[int, Tuple[tuple, RenderedPoll]] = LRUCache(self.CACHE_SIZE)
+
+    def render(self, snapshot: PollSnapshot, poll_id: str, finished: bool = False) -> Tuple[RenderedPoll, bool]:
+        key = (
+            snapshot.options, snapshot.title, snapshot.description, snapshot.language, snapshot.started, poll_id,
+            finished
+        )
+        cached = self._cache.get(snapshot.rid)
+        if cached is not None and cached[0] == key:
+            return cached[1], False
+
+        total = snapshot.total_votes
+        parts = [
+            f"```\n{snapshot.description}```",
+            render_bar([option.vote_count for option in snapshot.options], total)
+        ]
+        if finished:
+            parts.append(self.translator.translate_sync(snapshot.language, key="poll.finished"))
+
+        parts.append(f"**Total Votes**: {total}")
+        parts.append(render_options(snapshot.options, total))
+
+        rendered = RenderedPoll(
+            title=self.translator.translate_sync(
+                snapshot.language,
+                key="poll.title",
+                name=snapshot.title.upper() if finished else snapshot.title
+            ),
+            description="\n".join(parts),
+            footer=self.translator.translate_sync(
+                snapshot.language,
+                key="poll.footer",
+                id=poll_id
+            )
+        )
+        self._cache.set(snapshot.rid, (key, rendered))
+        return rendered, True
+
+    def forget(self, poll_rid: int):
+        self._cache.pop(poll_rid)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+from imp.better.logger import BetterLogger
+from imp.data.colors import Colors
+
+if TYPE_CHECKING:
+    from imp.better.bot import BetterBot
+    from imp.classes.poll import Poll
+    from imp.classes.snapshot import PollSnapshot
+
+
+class EmbedUpdateScheduler(BetterLogger):
+    # seconds during which vote marks are coalesced into a single edit
+    WINDOW = 3
+    # Discord allows 5 message edits per 5 seconds and channel
+    CHANNEL_EDITS = 5
+    CHANNEL_PERIOD = 5
+
+    def __init__(self, client: BetterBot):
+        self.client = client
+        self.dirty: Dict[int, int] = {}
+        self._buckets: Dict[int, Deque[float]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_dirty(self, poll_rid: int, votes: int = 1):
+        self.dirty[poll_rid] = self.dirty.get(poll_rid, 0) + votes
+        self._wakeup.set()
+
+    def discard(self, poll_rid: int):
+        self.dirty.pop(poll_rid, None)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _channel_ready(self, channel_id: Optional[int], now: float) -> bool:
+        if channel_id is None:
+            return True
+
+        bucket = self._buckets.get(channel_id)
+        if bucket is None:
+            return True
+
+        while bucket and now - bucket[0] >= self.CHANNEL_PERIOD:
+            bucket.popleft()
+
+        if not bucket:
+            del self._buckets[channel_id]
+            return True
+
+        return len(bucket) < self.CHANNEL_EDITS
+
+    def _consume(self, channel_id: Optional[int], now: float):
+        if channel_id is not None:
+            self._buckets.setdefault(channel_id, deque()).append(now)
+
+    def _ready_polls(self, now: float) -> List[Poll]:
+        ready: List[Poll] = []
+        planned: Dict[int, int] = {}
+
+        # polls with the most pending votes go first
+        for poll_rid, _ in sorted(self.dirty.items(), key=lambda item: item[1], reverse=True):
+            poll = self.client.manager.get_poll(poll_rid)
+            channel_id = poll.known_channel_id
+
+            if not self._channel_ready(channel_id, now):
+                continue
+
+            if channel_id is not None:
+                used = len(self._buckets.get(channel_id, ())) + planned.get(channel_id, 0)
+                if used >= self.CHANNEL_EDITS:
+                    continue
+
+                planned[channel_id] = planned.get(channel_id, 0) + 1
+
+            ready.append(poll)
+
+        return ready
+
+    async def flush(self):
+        loop = asyncio.get_running_loop()
+        ready = self._ready_polls(loop.time())
+
+        snapshots: List[Tuple[Poll, PollSnapshot]] = []
+        if ready:
+            async with self.client.acquire("scheduler.flush") as cursor:
+                for poll in ready:
+                    # marks arriving during the edit stay dirty for the next window
+                    self.dirty.pop(poll.rid, None)
+
+                    try:
+                        snapshots.append((poll, await poll.snapshot(cursor)))
+
+                    except Exception as e:
+                        self.log(
+                            "flush", "Loading poll %d failed: %r", Colors.RED, poll.rid, e, level=logging.ERROR
+                        )
+
+        # the edits can wait on rate limits, the connection is back in the pool by then
+        for poll, snapshot in snapshots:
+            try:
+                await poll.show(snapshot)
+
+            except Exception as e:
+                self.log("flush", "Updating poll %d failed: %r", Colors.RED, poll.rid, e, level=logging.ERROR)
+
+            self._consume(poll.known_channel_id, loop.time())
+
+        if self.dirty:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.WINDOW)
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+
+            except Exception as e:
+                # e.g. no connection to be had; the dirty marks stay, back off instead of ending the only update task
+                self.log("flush", "Flushing updates failed: %r", Colors.RED, e, level=logging.ERROR)
+                self._wakeup.set()
+                await asyncio.sleep(self.WINDOW)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from itertools import repeat
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from asyncpg import Record
+
+from imp.classes.config import PollConfig
+
+
+class OptionSnapshot(NamedTuple):
+    rid: int
+    name: str
+    vote_count: int
+
+
+class PollSnapshot(NamedTuple):
+    rid: int
+    guild_rid: int
+    started: bool
+    title: Optional[str]
+    description: Optional[str]
+    channel_id: int
+    message_id: int
+    language: Optional[str]
+    options: Tuple[OptionSnapshot, ...]
+
+    @classmethod
+    def from_record(cls, record: Record) -> PollSnapshot:
+        return cls(
+            rid=record["id"],
+            guild_rid=record["guild"],
+            started=record["started"],
+            title=record["title"],
+            description=record["description"],
+            channel_id=record["channel"],
+            message_id=record["message"],
+            language=record["display_language"],
+            options=tuple(
+                OptionSnapshot(*option) for option in zip(
+                    record["option_ids"],
+                    record["option_names"],
+                    # bulk loads leave counting to the vote tally
+                    record.get("option_votes") or repeat(0)
+                )
+            )
+        )
+
+    def with_counts(self, counts: Dict[int, int]) -> PollSnapshot:
+        return self._replace(
+            options=tuple(option._replace(vote_count=counts.get(option.rid, 0)) for option in self.options)
+        )
+
+    @property
+    def config(self) -> PollConfig:
+        return PollConfig(
+            guild_rid=self.guild_rid,
+            channel_id=self.channel_id,
+            message_id=self.message_id,
+            title=self.title,
+            description=self.description
+        )
+
+    @property
+    def total_votes(self) -> int:
+        return sum(option.vote_count for option in self.options)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, Set
+
+from asyncpg import Record
+
+from imp.better.logger import BetterLogger
+
+if TYPE_CHECKING:
+    from imp.better.bot import BetterBot
+
+
+class PollTally:
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.voters: Set[int] = set()
+
+
+class VoteTally(BetterLogger):
+    def __init__(self, client: BetterBot):
+        self.client = client
+        self.polls: Dict[int, PollTally] = {}
+
+    def load(self, records: Iterable[Record]):
+        for poll_rid, option_rid, voters in records:
+            tally = self.polls.setdefault(poll_rid, PollTally())
+            tally.counts[option_rid] = len(voters)
+            tally.voters.update(voters)
+
+    def track(self, poll_rid: int):
+        self.polls.setdefault(poll_rid, PollTally())
+
+    def discard(self, poll_rid: int):
+        self.polls.pop(poll_rid, None)
+
+    def loaded(self, poll_rid: int) -> bool:
+        return poll_rid in self.polls
+
+    def voted(self, poll_rid: int, user: int) -> bool:
+        tally = self.polls.get(poll_rid)
+        return tally is not None and user in tally.voters
+
+    def count(self, poll_rid: int, option_rid: int, user: int) -> bool:
+        tally = self.polls[poll_rid]
+        if user in tally.voters:
+            return False
+
+        tally.voters.add(user)
+        tally.counts[option_rid] = tally.counts.get(option_rid, 0) + 1
+        return True
+
+    def add(self, poll_rid: int, option_rid: int, user: int) -> bool:
+        # the caller makes sure the ingest queue has room, see Poll.vote
+        if not self.count(poll_rid, option_rid, user):
+            return False
+
+        self.client.ingest.put(poll_rid, option_rid, user)
+        return True
+
+    def counts(self, poll_rid: int) -> Dict[int, int]:
+        return self.polls[poll_rid].counts
@@ -1,4 +1,6 @@
 class PollVote:
+    __slots__ = ("user", "poll", "option")
+
     def __init__(self, user: int, poll_rid: int, option_rid: int):
         self.user = user
         self.poll = poll_rid
@@ -1,7 +1,10 @@
 from typing import Optional, Iterable, TypeVar, Tuple, List
 
-from asyncpg import Connection
-from hashids import Hashids
+from asyncpg import Connection, Record
+from asyncpg.cursor import CursorFactory
+
+from imp.better.hashids import BetterHashids
+from imp.database.statements import StatementRegistry
 
 T = TypeVar("T")
 
@@ -14,61 +17,172 @@ DB_LIST = Optional[List[T]]
 DB_GENERIC = Optional[Tuple[T, ]]
 RT_GENERIC = Optional[T]
 
-"""
-CREATE TABLE guilds (
-    "id" SERIAL PRIMARY KEY NOT NULL UNIQUE,
-    "guild_id" BIGINT NOT NULL UNIQUE
-);
-
-CREATE TABLE guild_settings (
-    "guild" BIGINT PRIMARY KEY NOT NULL UNIQUE,
-    "display_language" VARCHAR(5) NOT NULL DEFAULT 'de-de',
-     
-    CONSTRAINT fk_guild FOREIGN KEY("guild") REFERENCES guilds("id") ON DELETE CASCADE
-);
-
-CREATE TABLE polls (
-    "id" SERIAL PRIMARY KEY NOT NULL UNIQUE,
-    "guild" BIGINT NOT NULL,
-    "started" BOOLEAN NOT NULL DEFAULT FALSE,
-    
-    CONSTRAINT fk_guild FOREIGN KEY("guild") REFERENCES guilds("id") ON DELETE CASCADE
-);
-
-CREATE TABLE poll_config (
-    "poll" BIGINT PRIMARY KEY NOT NULL UNIQUE,
-    
-    "title" TEXT,
-    "description" TEXT,
-    "channel" BIGINT NOT NULL,
-    "message" BIGINT NOT NULL,
-    
-    CONSTRAINT fk_poll FOREIGN KEY("poll") REFERENCES polls("id") ON DELETE CASCADE
-);
-
-CREATE TABLE poll_options (
-    "id" SERIAL PRIMARY KEY NOT NULL UNIQUE,
-    "poll" BIGINT NOT NULL,
-    "name" TEXT NOT NULL,
-    
-    CONSTRAINT fk_poll FOREIGN KEY("poll") REFERENCES polls("id") ON DELETE CASCADE
-);
-
-CREATE TABLE poll_votes (
-    "id" SERIAL PRIMARY KEY NOT NULL UNIQUE,
-    "option" BIGINT NOT NULL,
-    "user" BIGINT NOT NULL,
-    UNIQUE("option", "user"),
-    
-    CONSTRAINT fk_option FOREIGN KEY("option") REFERENCES poll_options("id") ON DELETE CASCADE
-);
-
-"""
+# the schema lives in imp/database/migrations.py
+
+
+STATEMENTS = StatementRegistry()
+
+GUILD_ID_EXISTS = STATEMENTS.register(
+    "guild_id_exists",
+    "SELECT EXISTS(SELECT 1 FROM guilds WHERE \"guild_id\" = $1);"
+)
+CREATE_GUILD = STATEMENTS.register(
+    "create_guild",
+    "INSERT INTO guilds(\"guild_id\") VALUES($1) RETURNING \"id\";"
+)
+CREATE_GUILD_SETTINGS = STATEMENTS.register(
+    "create_guild_settings",
+    "INSERT INTO guild_settings(\"guild\") VALUES($1);"
+)
+GET_GUILD_RID = STATEMENTS.register(
+    "get_guild_rid",
+    "SELECT \"id\" FROM guilds WHERE \"guild_id\" = $1;"
+)
+GUILD_LANGUAGE = STATEMENTS.register(
+    "guild_language",
+    "SELECT \"display_language\" FROM guild_settings WHERE \"guild\" = $1;"
+)
+SET_GUILD_LANGUAGE = STATEMENTS.register(
+    "set_guild_language",
+    "UPDATE guild_settings SET \"display_language\" = $1 WHERE guild = $2;"
+)
+GUILD_POLL_IDS = STATEMENTS.register(
+    "guild_poll_ids",
+    "SELECT \"id\" FROM polls WHERE \"guild\" = $1"
+)
+POLL_EXISTS = STATEMENTS.register(
+    "poll_exists",
+    "SELECT EXISTS(SELECT 1 FROM polls WHERE \"id\" = $1);"
+)
+POLL_STARTED = STATEMENTS.register(
+    "poll_started",
+    "SELECT \"started\" FROM polls WHERE \"id\" = $1"
+)
+POLL_USER_VOTED = STATEMENTS.register(
+    "poll_user_voted",
+    "SELECT EXISTS(SELECT 1 FROM poll_votes WHERE \"poll\" = $1 AND \"user\" = $2)"
+)
+POLL_OPTION_COUNT = STATEMENTS.register(
+    "poll_option_count",
+    "SELECT COUNT(\"option\".\"id\") FROM poll_options AS \"option\" JOIN polls AS \"poll\" ON "
+    "\"option\".\"poll\" = \"poll\".\"id\" WHERE \"poll\".\"id\" = $1"
+)
+POLL_VOTE_COUNT = STATEMENTS.register(
+    "poll_vote_count",
+    "SELECT \"vote_count\" FROM polls WHERE \"id\" = $1"
+)
+POLL_START = STATEMENTS.register(
+    "poll_start",
+    "UPDATE polls SET \"started\" = TRUE WHERE \"id\" = $1"
+)
+POLL_STOP = STATEMENTS.register(
+    "poll_stop",
+    "UPDATE polls SET \"started\" = FALSE WHERE \"id\" = $1"
+)
+POLL_DELETE = STATEMENTS.register(
+    "poll_delete",
+    "DELETE FROM polls WHERE \"id\" = $1"
+)
+CREATE_POLL = STATEMENTS.register(
+    "create_poll",
+    "INSERT INTO polls(\"guild\") VALUES($1) RETURNING \"id\";"
+)
+CREATE_POLL_CONFIG = STATEMENTS.register(
+    "create_poll_config",
+    "INSERT INTO poll_config(\"poll\", \"channel\", \"message\", \"title\", \"description\") "
+    "VALUES($1, $2, $3, $4, $5);"
+)
+POLL_OPTIONS = STATEMENTS.register(
+    "poll_options",
+    "SELECT \"id\" FROM poll_options WHERE \"poll\" = $1"
+)
+POLL_CONFIG = STATEMENTS.register(
+    "poll_config",
+    "SELECT \"poll\".\"guild\", \"config\".\"channel\", \"config\".\"message\", \"config\".\"title\", "
+    "\"config\".\"description\" FROM polls AS \"poll\" "
+    "JOIN poll_config AS \"config\" ON \"config\".\"poll\" = \"poll\".\"id\" WHERE \"poll\".\"id\" = $1"
+)
+POLL_SNAPSHOT = STATEMENTS.register(
+    "poll_snapshot",
+    "SELECT \"poll\".\"id\", \"poll\".\"guild\", \"poll\".\"started\", \"config\".\"title\", "
+    "\"config\".\"description\", \"config\".\"channel\", \"config\".\"message\", "
+    "\"settings\".\"display_language\", "
+    "coalesce(array_agg(\"option\".\"id\" ORDER BY \"option\".\"id\") "
+    "FILTER (WHERE \"option\".\"id\" IS NOT NULL), '{}') AS \"option_ids\", "
+    "coalesce(array_agg(\"option\".\"name\" ORDER BY \"option\".\"id\") "
+    "FILTER (WHERE \"option\".\"id\" IS NOT NULL), '{}') AS \"option_names\", "
+    "coalesce(array_agg(\"option\".\"vote_count\" ORDER BY \"option\".\"id\") "
+    "FILTER (WHERE \"option\".\"id\" IS NOT NULL), '{}') AS \"option_votes\" "
+    "FROM polls AS \"poll\" JOIN poll_config AS \"config\" ON \"config\".\"poll\" = \"poll\".\"id\" "
+    "LEFT JOIN guild_settings AS \"settings\" ON \"settings\".\"guild\" = \"poll\".\"guild\" "
+    "LEFT JOIN poll_options AS \"option\" ON \"option\".\"poll\" = \"poll\".\"id\" "
+    "WHERE \"poll\".\"id\" = $1 GROUP BY \"poll\".\"id\", \"config\".\"poll\", \"settings\".\"guild\""
+)
+CREATE_POLL_OPTIONS = STATEMENTS.register(
+    "create_poll_options",
+    "INSERT INTO poll_options(\"poll\", \"name\") SELECT $1, \"option\".\"name\" "
+    "FROM unnest($2::TEXT[]) WITH ORDINALITY AS \"option\"(\"name\", \"position\") "
+    "ORDER BY \"option\".\"position\" RETURNING \"id\""
+)
+POLL_OPTION_NAME = STATEMENTS.register(
+    "poll_option_name",
+    "SELECT \"name\" FROM poll_options WHERE \"id\" = $1"
+)
+OPTION_VOTE_COUNT = STATEMENTS.register(
+    "option_vote_count",
+    "SELECT \"vote_count\" FROM poll_options WHERE \"id\" = $1"
+)
+OPTION_POLL = STATEMENTS.register(
+    "option_poll",
+    "SELECT \"poll\".\"id\" FROM poll_options AS \"option\" JOIN polls AS \"poll\" on \"option\".\"poll\" = "
+    "\"poll\".\"id\" WHERE \"option\".\"id\" = $1"
+)
+VOTE_TALLY = STATEMENTS.register(
+    "vote_tally",
+    "SELECT \"option\".\"poll\", \"option\".\"id\", "
+    "coalesce(array_agg(\"vote\".\"user\") FILTER (WHERE \"vote\".\"id\" IS NOT NULL), '{}') "
+    "FROM poll_options AS \"option\" "
+    "LEFT JOIN poll_votes AS \"vote\" ON \"vote\".\"option\" = \"option\".\"id\" GROUP BY \"option\".\"id\""
+)
+VOTE_COUNT_DRIFT = STATEMENTS.register(
+    "vote_count_drift",
+    "SELECT \"option\".\"poll\", \"option\".\"id\", \"option\".\"vote_count\", count(\"vote\".\"id\") "
+    "FROM poll_options AS \"option\" LEFT JOIN poll_votes AS \"vote\" ON \"vote\".\"option\" = \"option\".\"id\" "
+    "GROUP BY \"option\".\"id\" HAVING \"option\".\"vote_count\" <> count(\"vote\".\"id\")"
+)
+REPAIR_OPTION_VOTE_COUNTS = STATEMENTS.register(
+    "repair_option_vote_counts",
+    "WITH \"repaired\" AS (UPDATE poll_options AS \"option\" SET \"vote_count\" = \"counted\".\"count\" "
+    "FROM (SELECT \"option\".\"id\", count(\"vote\".\"id\") AS \"count\" FROM poll_options AS \"option\" "
+    "LEFT JOIN poll_votes AS \"vote\" ON \"vote\".\"option\" = \"option\".\"id\" GROUP BY \"option\".\"id\") "
+    "AS \"counted\" WHERE \"counted\".\"id\" = \"option\".\"id\" "
+    "AND \"option\".\"vote_count\" <> \"counted\".\"count\" "
+    "RETURNING 1) SELECT count(*) FROM \"repaired\""
+)
+REPAIR_POLL_VOTE_COUNTS = STATEMENTS.register(
+    "repair_poll_vote_counts",
+    "WITH \"repaired\" AS (UPDATE polls AS \"poll\" SET \"vote_count\" = \"counted\".\"count\" "
+    "FROM (SELECT \"poll\".\"id\", coalesce(sum(\"option\".\"vote_count\"), 0) AS \"count\" FROM polls AS \"poll\" "
+    "LEFT JOIN poll_options AS \"option\" ON \"option\".\"poll\" = \"poll\".\"id\" GROUP BY \"poll\".\"id\") "
+    "AS \"counted\" WHERE \"counted\".\"id\" = \"poll\".\"id\" AND \"poll\".\"vote_count\" <> \"counted\".\"count\" "
+    "RETURNING 1) SELECT count(*) FROM \"repaired\""
+)
+INSERT_VOTE = STATEMENTS.register(
+    "insert_vote",
+    "INSERT INTO poll_votes(\"poll\", \"option\", \"user\") SELECT \"poll\", \"id\", $3 FROM poll_options "
+    "WHERE \"id\" = $2 AND \"poll\" = $1 ON CONFLICT DO NOTHING RETURNING \"id\""
+)
 
 
 # noinspection PyMethodMayBeStatic
 class Database:
-    def __init__(self, guild_hashids: Hashids, poll_hashids: Hashids, option_hashids: Hashids, vote_hashids: Hashids):
+    def __init__(
+            self,
+            guild_hashids: BetterHashids,
+            poll_hashids: BetterHashids,
+            option_hashids: BetterHashids,
+            vote_hashids: BetterHashids
+    ):
         self._guild_hashids = guild_hashids
         self._poll_hashids = poll_hashids
         self._option_hashids = option_hashids
@@ -83,126 +197,75 @@ class Database:
         return x, y
 
     async def guild_id_exists(self, cursor: Connection, /, guild_id: int) -> RT_GENERIC[bool]:
-        values: DB_GENERIC[bool] = await cursor.fetchrow(
-            "SELECT EXISTS(SELECT 1 FROM guilds WHERE \"guild_id\" = $1);",
-            guild_id
-        )
+        values: DB_GENERIC[bool] = await STATEMENTS.fetchrow(cursor, GUILD_ID_EXISTS, guild_id)
         exists, *_ = Database.save_unpack(values)
 
         return exists
 
     async def create_guild(self, cursor: Connection, /, guild_id: int) -> RT_GENERIC[int]:
-        values: DB_GENERIC[str] = await cursor.fetchrow(
-            "INSERT INTO guilds(\"guild_id\") VALUES($1) RETURNING \"id\";",
-            guild_id
-        )
-        _guild_hid, *_ = Database.save_unpack(values)
+        async with cursor.transaction():
+            values: DB_GENERIC[str] = await STATEMENTS.fetchrow(cursor, CREATE_GUILD, guild_id)
+            _guild_hid, *_ = Database.save_unpack(values)
 
-        await cursor.execute("INSERT INTO guild_settings(\"guild\") VALUES($1);", _guild_hid)
+            await STATEMENTS.execute(cursor, CREATE_GUILD_SETTINGS, _guild_hid)
 
         return _guild_hid
 
     async def get_guild_rid(self, cursor: Connection, /, guild_id: int) -> RT_GENERIC[int]:
-        values: DB_GENERIC[int] = await cursor.fetchrow(
-            "SELECT \"id\" FROM guilds WHERE \"guild_id\" = $1;",
-            guild_id
-        )
+        values: DB_GENERIC[int] = await STATEMENTS.fetchrow(cursor, GET_GUILD_RID, guild_id)
         guild_rid, *_ = Database.save_unpack(values)
         return guild_rid
 
     async def guild_language(self, cursor: Connection, /, guild_rid: int) -> RT_GENERIC[str]:
-        values: DB_GENERIC[str] = await cursor.fetchrow(
-            "SELECT \"display_language\" FROM guild_settings WHERE \"guild\" = $1;",
-            guild_rid
-        )
+        values: DB_GENERIC[str] = await STATEMENTS.fetchrow(cursor, GUILD_LANGUAGE, guild_rid)
         display_language, *_ = Database.save_unpack(values)
 
         return display_language
 
     async def set_guild_language(self, cursor: Connection, /, guild_rid: int, language: str) -> None:
-        await cursor.execute(
-            "UPDATE guild_settings SET \"display_language\" = $1 WHERE guild = $2;",
-            language, guild_rid
-        )
+        await STATEMENTS.execute(cursor, SET_GUILD_LANGUAGE, language, guild_rid)
 
     async def guild_poll_ids(self, cursor: Connection, /, guild_rid: int) -> RT_GENERIC[List[str]]:
-        return await cursor.fetch("SELECT \"id\" FROM polls WHERE \"guild\" = $1", guild_rid)
+        return await STATEMENTS.fetch(cursor, GUILD_POLL_IDS, guild_rid)
 
     async def poll_exists(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[bool]:
-        values: DB_GENERIC[bool] = await cursor.fetchrow(
-            "SELECT EXISTS(SELECT 1 FROM polls WHERE \"id\" = $1);",
-            poll_rid
-        )
+        values: DB_GENERIC[bool] = await STATEMENTS.fetchrow(cursor, POLL_EXISTS, poll_rid)
 
         exists, *_ = Database.save_unpack(values)
         return exists
 
     async def poll_started(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[bool]:
-        values: DB_GENERIC[bool] = await cursor.fetchrow(
-            "SELECT \"started\" FROM polls WHERE \"id\" = $1",
-            poll_rid
-        )
+        values: DB_GENERIC[bool] = await STATEMENTS.fetchrow(cursor, POLL_STARTED, poll_rid)
         started, *_ = Database.save_unpack(values)
 
         return started
 
     async def poll_user_voted(self, cursor: Connection, /, poll_rid: int, user_id: int) -> RT_GENERIC[bool]:
-        values: DB_GENERIC[bool] = await cursor.fetchrow(
-            "SELECT EXISTS(SELECT 1 FROM poll_votes AS \"vote\" JOIN poll_options AS \"option\" ON "
-            "\"vote\".\"option\" = \"option\".\"id\" WHERE \"option\".\"poll\" = $1 AND \"user\" = $2)",
-            poll_rid, user_id
-        )
+        values: DB_GENERIC[bool] = await STATEMENTS.fetchrow(cursor, POLL_USER_VOTED, poll_rid, user_id)
         voted, *_ = Database.save_unpack(values)
 
         return voted
 
-    async def poll_title(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[str]:
-        values: DB_GENERIC[str] = await cursor.fetchrow(
-            "SELECT \"title\" FROM poll_config WHERE \"poll\" = $1",
-            poll_rid
-        )
-        title, *_ = Database.save_unpack(values)
-
-        return title
-
     async def poll_option_count(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[int]:
-        values: DB_GENERIC[int] = await cursor.fetchrow(
-            "SELECT COUNT(\"option\".\"id\") FROM poll_options AS \"option\" JOIN polls AS \"poll\" ON "
-            "\"option\".\"poll\" = \"poll\".\"id\" WHERE \"poll\".\"id\" = $1",
-            poll_rid
-        )
+        values: DB_GENERIC[int] = await STATEMENTS.fetchrow(cursor, POLL_OPTION_COUNT, poll_rid)
         count, *_ = Database.save_unpack(values)
 
         return count
 
     async def poll_vote_count(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[int]:
-        values: DB_GENERIC[int] = await cursor.fetchrow(
-            "SELECT count(\"poll\".\"id\") FROM poll_votes AS \"vote\" JOIN poll_options AS \"option\" ON "
-            "\"vote\".\"option\" = \"option\".\"id\" JOIN polls AS \"poll\" ON \"option\".\"poll\" = \"poll\".\"id\" "
-            "WHERE \"poll\".\"id\" = $1",
-            poll_rid
-        )
+        values: DB_GENERIC[int] = await STATEMENTS.fetchrow(cursor, POLL_VOTE_COUNT, poll_rid)
         count, *_ = Database.save_unpack(values)
 
         return count
 
-    async def poll_description(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[str]:
-        values: DB_GENERIC[str] = await cursor.fetchrow(
-            "SELECT \"description\" FROM poll_config WHERE \"poll\" = $1",
-            poll_rid
-        )
-        description, *_ = Database.save_unpack(values)
-
-        return description
-
     async def poll_start(self, cursor: Connection, /, poll_rid: int) -> None:
-        await cursor.execute("UPDATE polls SET \"started\" = TRUE WHERE \"id\" = $1", poll_rid)
+        await STATEMENTS.execute(cursor, POLL_START, poll_rid)
 
     async def poll_stop(self, cursor: Connection, /, poll_rid: int) -> None:
-        await cursor.execute("UPDATE polls SET \"started\" = FALSE WHERE \"id\" = $1", poll_rid)
+        await STATEMENTS.execute(cursor, POLL_STOP, poll_rid)
 
     async def poll_delete(self, cursor: Connection, /, poll_rid: int) -> None:
-        await cursor.execute("DELETE FROM polls WHERE \"id\" = $1", poll_rid)
+        await STATEMENTS.execute(cursor, POLL_DELETE, poll_rid)
 
     async def create_poll(
             self,
@@ -214,106 +277,113 @@ class Database:
             poll_title: str,
             poll_description: str
     ) -> RT_GENERIC[int]:
-        values: DB_GENERIC[int] = await cursor.fetchrow(
-            "INSERT INTO polls(\"guild\") VALUES($1) RETURNING \"id\";",
-            guild_rid
-        )
-        poll_rid, *_ = Database.save_unpack(values)
+        async with cursor.transaction():
+            values: DB_GENERIC[int] = await STATEMENTS.fetchrow(cursor, CREATE_POLL, guild_rid)
+            poll_rid, *_ = Database.save_unpack(values)
 
-        await cursor.execute(
-            "INSERT INTO poll_config(\"poll\", \"channel\", \"message\", \"title\", \"description\") VALUES($1, $2, "
-            "$3, $4, $5);",
-            poll_rid, channel_id, message_id, poll_title, poll_description
-        )
+            await STATEMENTS.execute(
+                cursor, CREATE_POLL_CONFIG, poll_rid, channel_id, message_id, poll_title, poll_description
+            )
         return poll_rid
 
-    async def poll_guild(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[int]:
-        values: DB_GENERIC[int] = await cursor.fetchrow(
-            "SELECT \"guild\".\"id\" FROM polls AS \"poll\" JOIN guilds AS \"guild\" ON \"poll\".\"guild\" = "
-            "\"guild\".\"id\" WHERE \"poll\".\"id\" = $1",
-            poll_rid
-        )
-        guild_rid, *_ = Database.save_unpack(values)
-        return guild_rid
-
-    async def poll_channel_id(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[int]:
-        values: DB_GENERIC[int] = await cursor.fetchrow(
-            "SELECT \"channel\" FROM poll_config WHERE \"poll\" = $1",
-            poll_rid
-        )
-        channel_id, *_ = Database.save_unpack(values)
-
-        return channel_id
-
     async def poll_options(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[List[int]]:
-        options: Optional[List[Tuple[int, ]]] = await cursor.fetch(
-            "SELECT \"id\" FROM poll_options WHERE \"poll\" = $1",
-            poll_rid
-        )
+        options: Optional[List[Tuple[int, ]]] = await STATEMENTS.fetch(cursor, POLL_OPTIONS, poll_rid)
         return [
             option for option, in options
         ]
 
-    async def poll_message_id(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[int]:
-        values: DB_GENERIC[int] = await cursor.fetchrow(
-            "SELECT \"message\" FROM poll_config WHERE \"poll\" = $1",
-            poll_rid
-        )
-        message_id, *_ = Database.save_unpack(values)
+    async def poll_config(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[Record]:
+        return await STATEMENTS.fetchrow(cursor, POLL_CONFIG, poll_rid)
 
-        return message_id
+    async def poll_snapshot(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[Record]:
+        return await STATEMENTS.fetchrow(cursor, POLL_SNAPSHOT, poll_rid)
 
-    async def create_poll_option(self, cursor: Connection, /, poll_rid: int, name: str) -> RT_GENERIC[int]:
-        values: DB_GENERIC[int] = await cursor.fetchrow(
-            "INSERT INTO poll_options(\"poll\", \"name\") VALUES($1, $2) RETURNING \"id\"",
-            poll_rid, name
-        )
-        option_rid, *_ = Database.save_unpack(values)
-        return option_rid
+    async def create_poll_options(
+            self,
+            cursor: Connection,
+            /,
+            poll_rid: int,
+            names: List[str]
+    ) -> RT_GENERIC[List[int]]:
+        options: List[Tuple[int, ]] = await STATEMENTS.fetch(cursor, CREATE_POLL_OPTIONS, poll_rid, names)
+        return [
+            option for option, in options
+        ]
 
     async def poll_option_name(self, cursor: Connection, /, option_rid: int) -> RT_GENERIC[str]:
-        values: DB_GENERIC[str] = await cursor.fetchrow(
-            "SELECT \"name\" FROM poll_options WHERE \"id\" = $1",
-            option_rid
-        )
+        values: DB_GENERIC[str] = await STATEMENTS.fetchrow(cursor, POLL_OPTION_NAME, option_rid)
         name, *_ = Database.save_unpack(values)
 
         return name
 
-    async def longest_poll_option_name(self, cursor: Connection, /, poll_rid: int) -> RT_GENERIC[int]:
-        values: DB_GENERIC[int] = await cursor.fetchrow(
-            "SELECT length(\"name\") FROM poll_options WHERE \"poll\" = $1 ORDER BY length(\"name\") DESC LIMIT 1",
-            poll_rid
-        )
-        max_length, *_ = Database.save_unpack(values)
-
-        return max_length
-
     async def option_vote_count(self, cursor: Connection, /, option_rid: int) -> RT_GENERIC[int]:
-        values: DB_INT = await cursor.fetchrow(
-            "SELECT count(\"id\") FROM poll_votes WHERE \"option\" = $1",
-            option_rid
-        )
+        values: DB_INT = await STATEMENTS.fetchrow(cursor, OPTION_VOTE_COUNT, option_rid)
         count, *_ = Database.save_unpack(values)
 
         return count
 
-    async def poll_option_exists(self, cursor: Connection, /, option_rid: int) -> RT_GENERIC[bool]:
-        values: DB_BOOL = await cursor.fetchrow(
-            "SELECT EXISTS(SELECT 1 FROM poll_options AS \"option\" JOIN polls AS \"poll\" on \"option\".\"poll\" = "
-            "\"poll\".\"id\" WHERE \"option\".\"id\" = $1)",
-            option_rid
-        )
-        option_exists, *_ = Database.save_unpack(values)
-
-        return option_exists
-
     async def option_poll(self, cursor: Connection, /, option_rid: int) -> RT_GENERIC[str]:
-        values: DB_GENERIC[int] = await cursor.fetchrow(
-            "SELECT \"poll\".\"id\" FROM poll_options AS \"option\" JOIN polls AS \"poll\" on \"option\".\"poll\" = "
-            "\"poll\".\"id\" WHERE \"option\".\"id\" = $1",
-            option_rid
-        )
+        values: DB_GENERIC[int] = await STATEMENTS.fetchrow(cursor, OPTION_POLL, option_rid)
         poll_hid, *_ = Database.save_unpack(values)
 
         return poll_hid
+
+    async def vote_tally(self, cursor: Connection, /) -> RT_GENERIC[List[Record]]:
+        return await STATEMENTS.fetch(cursor, VOTE_TALLY)
+
+    async def merge_votes(self, cursor: Connection, /, votes: List[Tuple[int, int, int]]) -> None:
+        # COPY into a per-connection staging table, then one merge; the staging rows only live until the commit.
+        # neither statement goes through STATEMENTS, the temporary table does not exist when connections are set up
+        async with cursor.transaction():
+            await cursor.execute(
+                "CREATE TEMPORARY TABLE IF NOT EXISTS poll_votes_staging "
+                "(\"poll\" BIGINT, \"option\" BIGINT, \"user\" BIGINT) ON COMMIT DELETE ROWS"
+            )
+            await cursor.copy_records_to_table(
+                "poll_votes_staging",
+                records=votes,
+                columns=("poll", "option", "user")
+            )
+            await cursor.execute(
+                "INSERT INTO poll_votes(\"poll\", \"option\", \"user\") "
+                "SELECT \"staged\".\"poll\", \"staged\".\"option\", \"staged\".\"user\" "
+                "FROM poll_votes_staging AS \"staged\" JOIN poll_options AS \"option\" "
+                "ON \"option\".\"id\" = \"staged\".\"option\" AND \"option\".\"poll\" = \"staged\".\"poll\" "
+                "ON CONFLICT DO NOTHING"
+            )
+
+    async def insert_vote(self, cursor: Connection, /, poll_rid: int, option_rid: int, user_id: int) -> RT_GENERIC[int]:
+        values: DB_GENERIC[int] = await STATEMENTS.fetchrow(cursor, INSERT_VOTE, poll_rid, option_rid, user_id)
+        vote_rid, *_ = Database.save_unpack(values)
+
+        return vote_rid
+
+    async def vote_count_drift(self, cursor: Connection, /) -> RT_GENERIC[List[Record]]:
+        return await STATEMENTS.fetch(cursor, VOTE_COUNT_DRIFT)
+
+    async def repair_vote_counts(self, cursor: Connection, /) -> RT_GENERIC[Tuple[int, int]]:
+        # the poll totals are summed from the option counters, so those have to be repaired first
+        async with cursor.transaction():
+            # votes written while the counts are taken would be overwritten by the older count. SHARE mode holds
+            # inserts and deletes until the commit and still lets reads through
+            await cursor.execute("LOCK TABLE poll_votes IN SHARE MODE")
+            options = await STATEMENTS.fetchval(cursor, REPAIR_OPTION_VOTE_COUNTS)
+            polls = await STATEMENTS.fetchval(cursor, REPAIR_POLL_VOTE_COUNTS)
+
+        return options, polls
+
+    def iter_polls(self, cursor: Connection, /, chunk_size: int) -> CursorFactory:
+        return cursor.cursor(
+            "SELECT \"poll\".\"id\", \"poll\".\"guild\", \"poll\".\"started\", \"config\".\"title\", "
+            "\"config\".\"description\", \"config\".\"channel\", \"config\".\"message\", "
+            "\"settings\".\"display_language\", "
+            "coalesce(array_agg(\"option\".\"id\" ORDER BY \"option\".\"id\") "
+            "FILTER (WHERE \"option\".\"id\" IS NOT NULL), '{}') AS \"option_ids\", "
+            "coalesce(array_agg(\"option\".\"name\" ORDER BY \"option\".\"id\") "
+            "FILTER (WHERE \"option\".\"id\" IS NOT NULL), '{}') AS \"option_names\" "
+            "FROM polls AS \"poll\" JOIN poll_config AS \"config\" ON \"config\".\"poll\" = \"poll\".\"id\" "
+            "LEFT JOIN guild_settings AS \"settings\" ON \"settings\".\"guild\" = \"poll\".\"guild\" "
+            "LEFT JOIN poll_options AS \"option\" ON \"option\".\"poll\" = \"poll\".\"id\" "
+            "GROUP BY \"poll\".\"id\", \"config\".\"poll\", \"settings\".\"guild\"",
+            prefetch=chunk_size
+        )
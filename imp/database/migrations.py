@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import time
+from typing import List, NamedTuple, Tuple
+
+from asyncpg import Connection
+
+from imp.better.logger import BetterLogger
+from imp.data.colors import Colors
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    statements: Tuple[str, ...]
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "schema", (
+        """
+        CREATE TABLE IF NOT EXISTS guilds (
+            "id" SERIAL PRIMARY KEY NOT NULL UNIQUE,
+            "guild_id" BIGINT NOT NULL UNIQUE
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS guild_settings (
+            "guild" BIGINT PRIMARY KEY NOT NULL UNIQUE,
+            "display_language" VARCHAR(5) NOT NULL DEFAULT 'de-de',
+
+            CONSTRAINT fk_guild FOREIGN KEY("guild") REFERENCES guilds("id") ON DELETE CASCADE
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS polls (
+            "id" SERIAL PRIMARY KEY NOT NULL UNIQUE,
+            "guild" BIGINT NOT NULL,
+            "started" BOOLEAN NOT NULL DEFAULT FALSE,
+
+            CONSTRAINT fk_guild FOREIGN KEY("guild") REFERENCES guilds("id") ON DELETE CASCADE
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS poll_config (
+            "poll" BIGINT PRIMARY KEY NOT NULL UNIQUE,
+
+            "title" TEXT,
+            "description" TEXT,
+            "channel" BIGINT NOT NULL,
+            "message" BIGINT NOT NULL,
+
+            CONSTRAINT fk_poll FOREIGN KEY("poll") REFERENCES polls("id") ON DELETE CASCADE
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS poll_options (
+            "id" SERIAL PRIMARY KEY NOT NULL UNIQUE,
+            "poll" BIGINT NOT NULL,
+            "name" TEXT NOT NULL,
+
+            CONSTRAINT fk_poll FOREIGN KEY("poll") REFERENCES polls("id") ON DELETE CASCADE
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS poll_votes (
+            "id" SERIAL PRIMARY KEY NOT NULL UNIQUE,
+            "option" BIGINT NOT NULL,
+            "user" BIGINT NOT NULL,
+            UNIQUE("option", "user"),
+
+            CONSTRAINT fk_option FOREIGN KEY("option") REFERENCES poll_options("id") ON DELETE CASCADE
+        );
+        """
+    )),
+    Migration(2, "hot_path_indexes", (
+        # guild_poll_ids, the poll autocomplete and the guild poll limit
+        "CREATE INDEX IF NOT EXISTS polls_guild_idx ON polls(\"guild\");",
+        # poll_options, snapshots and the option side of the "already voted" join, without touching the heap
+        "CREATE INDEX IF NOT EXISTS poll_options_poll_idx ON poll_options(\"poll\") INCLUDE (\"id\");",
+        # poll_votes("option") is served by the UNIQUE("option", "user") index already
+        "CREATE INDEX IF NOT EXISTS poll_votes_user_idx ON poll_votes(\"user\") INCLUDE (\"option\");"
+    )),
+    Migration(3, "vote_counters", (
+        "ALTER TABLE poll_options ADD COLUMN \"vote_count\" INTEGER NOT NULL DEFAULT 0;",
+        "ALTER TABLE polls ADD COLUMN \"vote_count\" INTEGER NOT NULL DEFAULT 0;",
+        """
+        UPDATE poll_options AS "option" SET "vote_count" = "counted"."count"
+        FROM (SELECT "option", count(*) AS "count" FROM poll_votes GROUP BY "option") AS "counted"
+        WHERE "counted"."option" = "option"."id";
+        """,
+        """
+        UPDATE polls AS "poll" SET "vote_count" = "counted"."count"
+        FROM (SELECT "poll", sum("vote_count") AS "count" FROM poll_options GROUP BY "poll") AS "counted"
+        WHERE "counted"."poll" = "poll"."id";
+        """,
+        # statement level, so a bulk insert of n votes costs one update per touched option instead of n
+        """
+        CREATE FUNCTION poll_votes_counted() RETURNS TRIGGER AS $$
+        BEGIN
+            WITH "changed" AS (
+                UPDATE poll_options AS "option" SET "vote_count" = "option"."vote_count" + "delta"."delta"
+                FROM (SELECT "option", count(*) AS "delta" FROM new_votes GROUP BY "option") AS "delta"
+                WHERE "delta"."option" = "option"."id"
+                RETURNING "option"."poll", "delta"."delta"
+            )
+            UPDATE polls AS "poll" SET "vote_count" = "poll"."vote_count" + "total"."delta"
+            FROM (SELECT "poll", sum("delta") AS "delta" FROM "changed" GROUP BY "poll") AS "total"
+            WHERE "total"."poll" = "poll"."id";
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        CREATE FUNCTION poll_votes_uncounted() RETURNS TRIGGER AS $$
+        BEGIN
+            WITH "changed" AS (
+                UPDATE poll_options AS "option" SET "vote_count" = "option"."vote_count" + "delta"."delta"
+                FROM (SELECT "option", -count(*) AS "delta" FROM old_votes GROUP BY "option") AS "delta"
+                WHERE "delta"."option" = "option"."id"
+                RETURNING "option"."poll", "delta"."delta"
+            )
+            UPDATE polls AS "poll" SET "vote_count" = "poll"."vote_count" + "total"."delta"
+            FROM (SELECT "poll", sum("delta") AS "delta" FROM "changed" GROUP BY "poll") AS "total"
+            WHERE "total"."poll" = "poll"."id";
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        CREATE TRIGGER poll_votes_count_insert AFTER INSERT ON poll_votes
+        REFERENCING NEW TABLE AS new_votes FOR EACH STATEMENT EXECUTE FUNCTION poll_votes_counted();
+        """,
+        """
+        CREATE TRIGGER poll_votes_count_delete AFTER DELETE ON poll_votes
+        REFERENCING OLD TABLE AS old_votes FOR EACH STATEMENT EXECUTE FUNCTION poll_votes_uncounted();
+        """
+    )),
+    Migration(4, "one_vote_per_poll", (
+        "ALTER TABLE poll_votes ADD COLUMN \"poll\" BIGINT;",
+        """
+        UPDATE poll_votes AS "vote" SET "poll" = "option"."poll"
+        FROM poll_options AS "option" WHERE "option"."id" = "vote"."option";
+        """,
+        # votes written before this rule existed may hold several votes of one user in a poll, the first one counts
+        """
+        DELETE FROM poll_votes AS "vote" USING poll_votes AS "first"
+        WHERE "first"."poll" = "vote"."poll" AND "first"."user" = "vote"."user" AND "first"."id" < "vote"."id";
+        """,
+        "ALTER TABLE poll_votes ALTER COLUMN \"poll\" SET NOT NULL;",
+        """
+        ALTER TABLE poll_votes
+        ADD CONSTRAINT fk_poll FOREIGN KEY("poll") REFERENCES polls("id") ON DELETE CASCADE,
+        ADD CONSTRAINT poll_votes_poll_user_key UNIQUE("poll", "user");
+        """,
+        # "has the user voted" is answered by the (poll, user) key now, the index only cost writes
+        "DROP INDEX IF EXISTS poll_votes_user_idx;"
+    )),
+]
+
+
+class Migrator(BetterLogger):
+    # any constant works, it only has to be the same for every instance of the bot
+    LOCK_ID = 0x706F6C6C
+
+    def __init__(self, migrations: List[Migration] = MIGRATIONS):
+        self.migrations = sorted(migrations, key=lambda migration: migration.version)
+
+    async def applied(self, cursor: Connection) -> List[int]:
+        return [
+            version for version, in await cursor.fetch("SELECT \"version\" FROM schema_migrations")
+        ]
+
+    async def migrate(self, cursor: Connection) -> int:
+        # two bots starting at the same time must not apply the same migration twice
+        await cursor.execute("SELECT pg_advisory_lock($1)", self.LOCK_ID)
+
+        try:
+            await cursor.execute(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                "\"version\" INTEGER PRIMARY KEY NOT NULL, "
+                "\"name\" TEXT NOT NULL, "
+                "\"applied_at\" TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+            applied = set(await self.applied(cursor))
+
+            count = 0
+            for migration in self.migrations:
+                if migration.version in applied:
+                    continue
+
+                start = time.perf_counter()
+                async with cursor.transaction():
+                    for statement in migration.statements:
+                        await cursor.execute(statement)
+
+                    await cursor.execute(
+                        "INSERT INTO schema_migrations(\"version\", \"name\") VALUES($1, $2)",
+                        migration.version, migration.name
+                    )
+
+                count += 1
+                self.log(
+                    "migrate",
+                    f"Applied migration {migration.version} ({migration.name}) in "
+                    f"{(time.perf_counter() - start) * 1000:.1f}ms",
+                    Colors.BLUE
+                )
+
+            return count
+
+        finally:
+            await cursor.execute("SELECT pg_advisory_unlock($1)", self.LOCK_ID)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from asyncpg import Connection, Pool
+
+from imp.better.logger import BetterLogger
+from imp.better.metrics import METRICS
+from imp.data.colors import Colors
+
+# keys of config["pool"] that are handed to asyncpg.create_pool
+SIZING = ("min_size", "max_size", "max_queries", "max_inactive_connection_lifetime")
+
+
+class PoolBudgetExceeded(RuntimeError):
+    pass
+
+
+class Lease:
+    __slots__ = ("guard", "pool", "callsite", "cursor", "acquired", "token", "task")
+
+    def __init__(self, guard: PoolGuard, pool: Pool, callsite: str):
+        self.guard = guard
+        self.pool = pool
+        self.callsite = callsite
+
+        self.cursor: Optional[Connection] = None
+        self.acquired = 0.0
+        self.token = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> Connection:
+        held = held_lease()
+        if held is not None:
+            # a second connection while holding one deadlocks once every holder waits for its second
+            self.guard.violation("nested", self.callsite, f"acquired while {held.callsite} holds a connection")
+
+        start = time.perf_counter()
+        self.guard.waiting += 1
+        try:
+            self.cursor = await self.pool.acquire()
+
+        finally:
+            self.guard.waiting -= 1
+
+        self.acquired = time.perf_counter()
+        METRICS.observe(f"pool_wait.{self.callsite}", self.acquired - start)
+
+        self.task = asyncio.current_task()
+        self.token = HELD.set(self)
+        return self.cursor
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        HELD.reset(self.token)
+
+        try:
+            await self.pool.release(self.cursor)
+
+        finally:
+            held = time.perf_counter() - self.acquired
+            self.cursor = self.token = self.task = None
+
+            METRICS.observe(f"pool_hold.{self.callsite}", held)
+            self.guard.check_budget(self.callsite, held)
+
+
+# the lease the current task holds
+HELD: ContextVar[Optional[Lease]] = ContextVar("HELD", default=None)
+
+
+def held_lease() -> Optional[Lease]:
+    # tasks created while a lease is held copy the context, but the connection is not theirs
+    lease = HELD.get()
+    if lease is None or lease.task is not asyncio.current_task():
+        return None
+
+    return lease
+
+
+class PoolGuard(BetterLogger):
+    # strict turns the http and nested reports into PoolBudgetExceeded. Only use it to hunt offenders in testing,
+    # discord calls made while holding a connection are logged as warnings otherwise
+    def __init__(self, budget: float = 1.0, budgets: Optional[Dict[str, float]] = None, strict: bool = False):
+        # seconds a callsite may hold a connection, budgets override the default per callsite
+        self.budget = budget
+        self.budgets = budgets or {}
+        self.strict = strict
+
+        self.waiting = 0
+        self.violations: Dict[str, int] = {}
+
+    def acquire(self, pool: Pool, callsite: str) -> Lease:
+        return Lease(self, pool, callsite)
+
+    def violation(self, kind: str, callsite: str, detail: str):
+        key = f"{kind}.{callsite}"
+        self.violations[key] = self.violations.get(key, 0) + 1
+        METRICS.count(f"pool_violations.{kind}")
+
+        if self.strict:
+            raise PoolBudgetExceeded(f"{callsite}: {detail}")
+
+        self.log("guard", "%s: %s", Colors.YELLOW, callsite, detail, level=logging.WARNING)
+
+    def check_budget(self, callsite: str, held: float):
+        budget = self.budgets.get(callsite, self.budget)
+        if budget is not None and held > budget:
+            # the connection is back in the pool already, so strict mode only reports here
+            key = f"budget.{callsite}"
+            self.violations[key] = self.violations.get(key, 0) + 1
+            METRICS.count("pool_violations.budget")
+            self.log(
+                "guard", "%s held a connection for %.3fs, budget %.3fs", Colors.YELLOW, callsite, held, budget,
+                level=logging.WARNING
+            )
+
+    def watch(self, *adapters: Any):
+        # discord REST calls go through HTTPClient.request, interaction responses and followups through the
+        # webhook adapter's request. Waiting on either with a connection checked out keeps the connection idle
+        # for a network round trip or a rate limit
+        for adapter in adapters:
+            adapter.request = self._guarded(adapter.request)
+
+    def _guarded(self, request: Callable) -> Callable:
+        @functools.wraps(request)
+        async def guarded(route, *args, **kwargs):
+            held = held_lease()
+            if held is not None:
+                self.violation("http", held.callsite, f"{route.method} {route.path} while holding a connection")
+
+            return await request(route, *args, **kwargs)
+
+        return guarded
+
+    def stats(self, pool: Pool) -> Dict[str, int]:
+        return {
+            "size": pool.get_size(),
+            "in_use": pool.get_size() - pool.get_idle_size(),
+            "max_size": pool.get_max_size(),
+            "waiting": self.waiting,
+            "violations": sum(self.violations.values())
+        }
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from asyncpg import Connection, Record
+from asyncpg.exceptions import FeatureNotSupportedError, InvalidCachedStatementError, PostgresError
+from asyncpg.prepared_stmt import PreparedStatement
+
+from imp.better.logger import BetterLogger
+from imp.data.colors import Colors
+
+
+class StatementConnection(Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # statement name -> prepared handle, valid for this connection only
+        self.statements: Dict[str, PreparedStatement] = {}
+
+
+class StatementRegistry(BetterLogger):
+    def __init__(self):
+        self.queries: Dict[str, str] = {}
+
+        self.prepares = 0
+        self.executions = 0
+
+    def register(self, name: str, query: str) -> str:
+        if name in self.queries:
+            raise ValueError(f"Statement {name} is already registered")
+
+        self.queries[name] = query
+        return name
+
+    async def prepare_all(self, connection: StatementConnection):
+        # used as the pool's connection init, so every connection starts with all statements prepared
+        for name, query in self.queries.items():
+            try:
+                connection.statements[name] = await connection.prepare(query)
+                self.prepares += 1
+
+            except PostgresError as e:
+                # e.g. the schema is not migrated yet, the statement is prepared on first use instead
+                self.log("prepare", "Could not prepare %s: %r", Colors.YELLOW, name, e, level=logging.WARNING)
+
+    async def statement(self, cursor: Connection, name: str) -> PreparedStatement:
+        statements: Dict[str, PreparedStatement] = cursor.statements
+        statement = statements.get(name)
+
+        if statement is None:
+            statement = statements[name] = await cursor.prepare(self.queries[name])
+            self.prepares += 1
+
+        return statement
+
+    async def _call(self, cursor: Connection, name: str, method: str, args: tuple) -> Any:
+        self.executions += 1
+
+        try:
+            return await getattr(await self.statement(cursor, name), method)(*args)
+
+        except (InvalidCachedStatementError, FeatureNotSupportedError):
+            # the schema changed under the prepared handle. inside a transaction the error aborted it already
+            cursor.statements.pop(name, None)
+            if cursor.is_in_transaction():
+                raise
+
+            return await getattr(await self.statement(cursor, name), method)(*args)
+
+    async def fetch(self, cursor: Connection, name: str, *args) -> List[Record]:
+        return await self._call(cursor, name, "fetch", args)
+
+    async def fetchrow(self, cursor: Connection, name: str, *args) -> Optional[Record]:
+        return await self._call(cursor, name, "fetchrow", args)
+
+    async def fetchval(self, cursor: Connection, name: str, *args) -> Any:
+        return await self._call(cursor, name, "fetchval", args)
+
+    async def execute(self, cursor: Connection, name: str, *args) -> None:
+        # prepared statements have no execute(), fetch() runs them the same way
+        await self._call(cursor, name, "fetch", args)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "statements": len(self.queries),
+            "prepares": self.prepares,
+            "executions": self.executions
+        }
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Any, Optional
+
+from asyncpg import Connection
+from asyncpg.transaction import Transaction
+
+if TYPE_CHECKING:
+    from imp.database.database import Database
+    from imp.database.pool import Lease
+
+
+class BoundDatabase:
+    __slots__ = ("database", "cursor")
+
+    def __init__(self, database: Database, cursor: Connection):
+        self.database = database
+        self.cursor = cursor
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.database, name)
+
+        # every query method takes the connection as its first, positional-only argument
+        if callable(attribute) and not name.startswith("_"):
+            return partial(attribute, self.cursor)
+
+        return attribute
+
+
+class UnitOfWork:
+    def __init__(self, lease: Lease, database: Database, readonly: bool = False):
+        self.lease = lease
+        self.readonly = readonly
+        self._database = database
+
+        self.cursor: Optional[Connection] = None
+        self.database: Optional[BoundDatabase] = None
+        self._transaction: Optional[Transaction] = None
+
+    async def __aenter__(self) -> UnitOfWork:
+        self.cursor = await self.lease.__aenter__()
+
+        try:
+            self._transaction = self.cursor.transaction(readonly=self.readonly)
+            await self._transaction.start()
+
+        except BaseException as e:
+            await self.lease.__aexit__(type(e), e, e.__traceback__)
+            raise
+
+        self.database = BoundDatabase(self._database, self.cursor)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                await self._transaction.commit()
+            else:
+                await self._transaction.rollback()
+
+        finally:
+            await self.lease.__aexit__(exc_type, exc_val, exc_tb)
+            self.cursor = self.database = self._transaction = None
@@ -1,3 +1,4 @@
 from imp.errors.check import *
 from imp.errors.transformers import *
 from imp.errors.poll import *
+from imp.errors.charts import *
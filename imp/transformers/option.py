@@ -8,7 +8,7 @@ from imp.classes.option import PollOption
 from imp.database.database import Database
 from imp.errors import TransformerException
 
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, List
 if TYPE_CHECKING:
     from imp.better.interaction import BetterInteraction
 
@@ -16,44 +16,28 @@ if TYPE_CHECKING:
 class Option_Transformer(app_commands.Transformer, ABC):
     @classmethod
     async def transform(cls, interaction: BetterInteraction, value: str) -> PollOption:
-        # todo: get all option rids -> convert to hids -> check similarity to value
-        async with interaction.client.pool.acquire() as cursor:
-            exists = await interaction.client.database.poll_option_exists(
+        option_rid, *_ = Database.save_unpack(interaction.client.option_hashids.decode(value))
+        if option_rid is None:
+            raise TransformerException(f"A poll option with the id `{value}` does not exist!")
+
+        async with interaction.client.acquire("transform.option") as cursor:
+            poll_rid = await interaction.client.database.option_poll(
                 cursor,
-                option_rid=value
+                option_rid=option_rid
             )
 
-            if not exists:
+            if poll_rid is None:
                 raise TransformerException(f"A poll option with the id `{value}` does not exist!")
 
-            poll_hid = await interaction.client.database.option_poll(
-                cursor,
-                option_rid=value
-            )
-
-            return await (interaction.client.manager.get_poll(poll_hid)).get_option(cursor, value)
+            return await (interaction.client.manager.get_poll(poll_rid)).get_option(cursor, option_rid)
 
     @classmethod
     async def autocomplete(cls, interaction: BetterInteraction, value: str) -> List[app_commands.Choice[str]]:
-        async with interaction.client.pool.acquire() as cursor:
-            poll_hid = interaction.namespace.poll
-            _poll_hid, *_ = Database.save_unpack(interaction.client.poll_hashids.decode(poll_hid))
-
-            if _poll_hid is None:
-                return []
-
-            # noinspection SpellCheckingInspection
-            _option_hids: List[Tuple[int, str]] = await cursor.fetch(
-                "SELECT id, name FROM poll_options WHERE poll = $1",
-                _poll_hid
-            )
-
-        value = value.lower()
-
-        choices: List[app_commands.Choice] = []
-        for _option_hid, name in _option_hids:
-            option_hid = interaction.client.option_hashids.encode(_option_hid)
-            if option_hid.lower().startswith(value) or name.lower().startswith(value):
-                choices.append(app_commands.Choice(name=f"{option_hid} ({name})", value=option_hid))
-
-        return choices
+        poll_rid, *_ = Database.save_unpack(interaction.client.poll_hashids.decode(interaction.namespace.poll or ""))
+        if poll_rid is None:
+            return []
+
+        return [
+            app_commands.Choice(name=f"{option_hid} ({name})", value=option_hid)
+            for option_hid, name in interaction.client.autocomplete.search_options(poll_rid, value)
+        ]
@@ -8,7 +8,7 @@ from imp.classes.poll import Poll
 from imp.database.database import Database
 from imp.errors import TransformerException
 
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, List
 if TYPE_CHECKING:
     from imp.better.interaction import BetterInteraction
 
@@ -16,31 +16,30 @@ if TYPE_CHECKING:
 class Poll_Transformer(app_commands.Transformer, ABC):
     @classmethod
     async def transform(cls, interaction: BetterInteraction, value: str) -> Poll:
-        # todo: get all poll rids -> convert to hids -> check similarity to value
-        async with interaction.client.pool.acquire() as cursor:
+        poll_rid, *_ = Database.save_unpack(interaction.client.poll_hashids.decode(value))
+        if poll_rid is None:
+            raise TransformerException(f"A poll with the id `{value}` does not exist!")
+
+        async with interaction.client.acquire("transform.poll") as cursor:
             exists = await interaction.client.database.poll_exists(
                 cursor,
-                poll_rid=value,
+                poll_rid=poll_rid,
             )
 
             if not exists:
                 raise TransformerException(f"A poll with the id `{value}` does not exist!")
 
-        return interaction.client.manager.get_poll(value)
+        return interaction.client.manager.get_poll(poll_rid)
 
     @classmethod
     async def autocomplete(cls, interaction: BetterInteraction, value: str) -> List[app_commands.Choice[str]]:
-        async with interaction.client.pool.acquire() as cursor:
-            guild_hid = await interaction.client.database.get_guild_id(cursor, guild_id=interaction.guild.id)
-            _guild_hid, *_ = Database.save_unpack(interaction.client.guild_hashids.decode(guild_hid))
-
-            _poll_ids: List[Tuple[int, str]] = await cursor.fetch("SELECT \"poll\".\"id\", \"config\".\"title\" FROM polls AS \"poll\" JOIN poll_config AS \"config\" ON \"config\".\"poll\" = \"poll\".\"id\" WHERE \"poll\".\"guild\" = $1", _guild_hid)
+        guild_rid = interaction.client.guild_cache.rids.get(interaction.guild.id)
 
-        value = value.lower()
-        choices: List[app_commands.Choice] = []
-        for _poll_hid, title in _poll_ids:
-            poll_hid = interaction.client.poll_hashids.encode(_poll_hid)
-            if poll_hid.lower().startswith(value) or title.lower().startswith(value.lower()):
-                choices.append(app_commands.Choice(name=f"{poll_hid} ({title})", value=poll_hid))
+        if guild_rid is None:
+            async with interaction.client.acquire("autocomplete.poll") as cursor:
+                guild_rid = await interaction.client.guild_cache.guild_rid(cursor, guild_id=interaction.guild.id)
 
-        return choices
+        return [
+            app_commands.Choice(name=f"{poll_hid} ({title})", value=poll_hid)
+            for poll_hid, title in interaction.client.autocomplete.search_polls(guild_rid, value)
+        ]
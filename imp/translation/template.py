@@ -0,0 +1,52 @@
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+FIELD = Tuple[str, str, Optional[str]]
+
+
+class Template:
+    __slots__ = ("text", "segments", "fields", "plain")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.segments: Tuple[Union[str, FIELD], ...] = self.parse(text)
+        self.fields = sum(1 for segment in self.segments if segment.__class__ is tuple)
+        # parse already unescaped "{{" and "}}" in the literal segments
+        self.plain = "".join(self.segments) if not self.fields else None
+
+    @staticmethod
+    def parse(text: str) -> Tuple[Union[str, FIELD], ...]:
+        segments: List[Union[str, FIELD]] = []
+
+        for literal, field, spec, conversion in Formatter().parse(text):
+            if literal:
+                segments.append(literal)
+
+            if field is not None:
+                segments.append((field, spec or "", conversion))
+
+        return tuple(segments)
+
+    def render(self, args: Dict[str, Any]) -> str:
+        if self.plain is not None:
+            return self.plain
+
+        parts: List[str] = []
+        for segment in self.segments:
+            if segment.__class__ is str:
+                parts.append(segment)
+                continue
+
+            name, spec, conversion = segment
+            # unknown fields are echoed back as "{name}", then converted and formatted like a value, as format_map did
+            value = args[name] if name in args else "{" + name + "}"
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            elif conversion == "a":
+                value = ascii(value)
+
+            parts.append(format(value, spec) if spec else str(value))
+
+        return "".join(parts)
@@ -1,22 +1,19 @@
 import json
 import os
-from typing import List, Dict, TYPE_CHECKING
+import time
+from typing import List, Dict, Optional, TYPE_CHECKING
 
 import aiofiles
 from asyncpg import Connection
 
 from imp.better.logger import BetterLogger
 from imp.data.colors import Colors
+from imp.translation.template import Template
 
 if TYPE_CHECKING:
     from imp.better.bot import BetterBot
 
 
-class AdvancedFormat(dict):
-    def __missing__(self, key):
-        return "{" + key + "}"
-
-
 class Translator(BetterLogger):
 
     DEFAULT_LOCALE = "de-de"
@@ -25,12 +22,14 @@ class Translator(BetterLogger):
     def __init__(self, client: "BetterBot"):
         self.client = client
         self.available_locales: List[str] = None
-        self.data: Dict[str, Dict[str, str]] = None
-        self.default_locale: Dict[str, str] = None
+        self.data: Dict[str, Dict[str, Template]] = None
+        self.default_locale: Dict[str, Template] = None
+        self.missing: Dict[str, List[str]] = None
 
     @classmethod
     async def load(cls, client: "BetterBot", locales_path: str):
         instance = cls(client)
+        started = time.perf_counter()
 
         async with aiofiles.open(os.path.join(locales_path, "locales.json"), "rb") as f:
             _available_locales = (await f.read()).decode()
@@ -42,23 +41,45 @@ class Translator(BetterLogger):
             main: List[str] = json.loads(_main)
             instance.log("load", f"{len(main)} translations in main.json")
 
-        data: Dict[str, Dict[str, str]] = {}
+        raw: Dict[str, Dict[str, str]] = {}
         for locale in available_locales:
             async with aiofiles.open(os.path.join(locales_path, locale + ".json"), "rb") as f:
                 _locale_data = (await f.read()).decode()
-                locale_data: dict[str, str] = json.loads(_locale_data)
-
-                if not all(key in locale_data for key in main):
-                    instance.log("load", f"Missing translations in {locale}", Colors.YELLOW)
+                raw[locale] = json.loads(_locale_data)
+
+        default = {
+            key: Template(text) for key, text in raw.get(instance.DEFAULT_LOCALE, {}).items()
+        }
+
+        data: Dict[str, Dict[str, Template]] = {}
+        missing: Dict[str, List[str]] = {}
+        for locale, locale_data in raw.items():
+            # fall back to the default locale once here instead of on every translation
+            templates = dict(default)
+            templates.update(
+                (key, Template(text)) for key, text in locale_data.items()
+            )
+            data[locale] = templates
+
+            missing[locale] = [key for key in main if key not in locale_data]
+            if missing[locale]:
+                instance.log(
+                    "load",
+                    f"Locale {locale} is missing {len(missing[locale])} translations: {', '.join(missing[locale])}",
+                    Colors.YELLOW
+                )
+
+            else:
+                instance.log("load", f"Locale {locale} loaded successfully")
 
-                else:
-                    data[locale] = locale_data
-                    instance.log("load", f"Locale {locale} loaded successfully")
-
-        instance.log("load", f"{len(data)} locales available")
         instance.available_locales = list(data.keys())
         instance.data = data
-        instance.default_locale = data.get(instance.DEFAULT_LOCALE)
+        instance.default_locale = data.get(instance.DEFAULT_LOCALE, default)
+        instance.missing = missing
+        instance.log(
+            "load",
+            f"{len(data)} locales available, loaded in {(time.perf_counter() - started) * 1000:.2f}ms"
+        )
 
         return instance
 
@@ -73,14 +94,16 @@ class Translator(BetterLogger):
             key: str,
             **format_args
     ):
-        guild_language = await self.client.database.guild_language(
+        guild_language = await self.client.guild_cache.language(
             cursor,
             guild_rid=guild_rid
         )
 
-        locale = self.data.get(guild_language, self.default_locale)
-        _translation = locale.get(key, f"<TRANSLATION:{key}>")
+        return self.translate_sync(guild_language, key, **format_args)
 
-        translation = _translation.format_map(AdvancedFormat(**format_args))
+    def translate_sync(self, language: Optional[str], /, key: str, **format_args) -> str:
+        template = self.data.get(language, self.default_locale).get(key)
+        if template is None:
+            return f"<TRANSLATION:{key}>"
 
-        return translation
+        return template.render(format_args)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+from imp.better.cache import LRUCache
+from imp.better.logger import BetterLogger
+from imp.better.metrics import METRICS
+from imp.data.colors import Colors
+from imp.errors import PollException
+from imp.views.poll import PollView
+
+if TYPE_CHECKING:
+    from imp.better.bot import BetterBot
+    from imp.better.interaction import BetterInteraction
+    from imp.classes.poll import Poll
+
+
+class PollCustomId(NamedTuple):
+    poll_rid: int
+    action: str
+    argument: Optional[str]
+
+    @classmethod
+    def parse(cls, custom_id: str) -> Optional[PollCustomId]:
+        # poll:{rid}:option:{hid} | poll:{rid}:start | poll:{rid}:stop
+        prefix, _, rest = custom_id.partition(":")
+        if prefix != "poll":
+            return None
+
+        poll_rid, _, rest = rest.partition(":")
+        action, _, argument = rest.partition(":")
+        if not poll_rid.isdigit() or not action:
+            return None
+
+        return cls(int(poll_rid), action, argument or None)
+
+
+class PollDispatcher(BetterLogger):
+    MAX_VIEWS = 1000
+
+    def __init__(self, client: BetterBot):
+        self.client = client
+        self.views: LRUCache[int, PollView] = LRUCache(self.MAX_VIEWS, on_evict=self._evicted)
+
+    def _evicted(self, _: int, view: PollView):
+        # drop the poll's reference too, so the evicted view can actually be collected
+        if view.poll.view is view:
+            view.poll.set_view(None)
+
+    def remember(self, poll_rid: int, view: PollView):
+        self.views.set(poll_rid, view)
+
+    def forget(self, poll_rid: int):
+        self.views.pop(poll_rid)
+
+    async def view(self, poll: Poll) -> PollView:
+        view = self.views.get(poll.rid)
+
+        # only a view that is not cached needs the database, clicks on cached views never wait on the pool
+        if view is None:
+            async with self.client.acquire("dispatch.view") as cursor:
+                view = await PollView(poll).run(cursor)
+            poll.set_view(view)
+
+        return view
+
+    async def dispatch(self, interaction: BetterInteraction) -> bool:
+        custom_id = PollCustomId.parse((interaction.data or {}).get("custom_id", ""))
+        if custom_id is None:
+            return False
+
+        poll = self.client.manager.get_poll(custom_id.poll_rid)
+        try:
+            view = await self.view(poll)
+
+        except PollException as e:
+            poll.forget()
+            await self.reply(interaction, e.message)
+            return True
+
+        item = next(
+            (item for item in view.children if getattr(item, "custom_id", None) == interaction.data["custom_id"]),
+            None
+        )
+        if item is None:
+            # the message shows components of an older state of the poll
+            self.log(
+                "dispatch", "Stale component %s", Colors.YELLOW, interaction.data["custom_id"], level=logging.WARNING
+            )
+            # without a response discord shows "This interaction failed"
+            guild_rid = poll.known_guild_rid
+            language = self.client.guild_cache.known_language(guild_rid) if guild_rid is not None else None
+            await self.reply(interaction, self.client.translator.translate_sync(language, key="poll.outdated"))
+            return True
+
+        try:
+            with METRICS.timer(f"button.{custom_id.action}"):
+                await item.callback(interaction)
+
+        except PollException as e:
+            # e.g. a second click on stop, the poll is deleted already
+            poll.forget()
+            await self.reply(interaction, e.message)
+
+        return True
+
+    @staticmethod
+    async def reply(interaction: BetterInteraction, content: str):
+        if interaction.response.is_done():
+            await interaction.followup.send(content=content, ephemeral=True)
+        else:
+            await interaction.response.send_message(content=content, ephemeral=True)
@@ -1,19 +1,18 @@
 from __future__ import annotations
 
-import asyncio
 from typing import TYPE_CHECKING
 
 import discord
 from asyncpg import Connection
 from discord import ui
 
-from imp.classes.vote import PollVote
 from imp.emoji import Emojis
 
 if TYPE_CHECKING:
     from imp.better.interaction import BetterInteraction
     from imp.classes.option import PollOption
     from imp.classes.poll import Poll
+    from imp.classes.snapshot import PollSnapshot
 
 
 class PollOptionButton(ui.Button):
@@ -26,37 +25,34 @@ class PollOptionButton(ui.Button):
         self.option = option
 
     async def callback(self, interaction: BetterInteraction):
-        async with interaction.client.pool.acquire() as cursor:
-            if await self.option.poll.user_voted(
-                    cursor,
-                    user=interaction.user.id
-            ):
-                return await interaction.response.send_message(
-                    content=await self.option.poll.client.translator.translate(
-                        cursor,
-                        guild_rid=await self.option.poll.guild_rid(cursor),
-                        key="poll.already_voted"
-                    ),
-                    ephemeral=True
-                )
-
-            await interaction.response.send_message(
-                content=await self.option.poll.client.translator.translate(
-                    cursor,
-                    guild_rid=await self.option.poll.guild_rid(cursor),
-                    key="poll.voted",
-                    option=await self.option.name(cursor)
-                ),
-                ephemeral=True
-            )
+        poll = self.option.poll
+        client = interaction.client
+        user = interaction.user.id
+
+        # clicks on polls held in memory are answered without taking a connection from the pool
+        voted = poll.vote_from_memory(self.option.rid, user)
+        guild_rid = poll.known_guild_rid
+        language = client.guild_cache.known_language(guild_rid) if guild_rid is not None else None
+        name = self.option.known_name
+
+        if voted is None or language is None or name is None:
+            # the reply is sent after the connection went back to the pool, it can wait on a rate limit
+            async with client.acquire("button.vote") as cursor:
+                if voted is None:
+                    voted = await poll.vote(cursor, self.option.rid, user)
+
+                language = await client.guild_cache.language(cursor, guild_rid=await poll.guild_rid(cursor))
+                name = await self.option.name(cursor)
+
+        if voted:
+            content = client.translator.translate_sync(language, key="poll.voted", option=name)
+        else:
+            content = client.translator.translate_sync(language, key="poll.already_voted")
 
-            await self.option.poll.add_vote(
-                cursor,
-                PollVote(interaction.user.id, self.option.poll.rid, self.option.rid)
-            )
-            await asyncio.sleep(self.option.poll.POLL_UPDATE_TIME)
-            if self.option.poll.update_ready():
-                await self.option.poll.update(cursor)
+        await interaction.response.send_message(
+            content=content,
+            ephemeral=True
+        )
 
 
 class PollStartButton(ui.Button):
@@ -69,22 +65,20 @@ class PollStartButton(ui.Button):
         self.poll = poll
 
     async def callback(self, interaction: BetterInteraction):
-        async with interaction.client.pool.acquire() as cursor:
-            await interaction.client.database.poll_start(
-                cursor,
-                poll_rid=self.poll.rid
-            )
-            await self.poll.update(cursor)
-            await interaction.response.send_message(
-                content=await self.poll.client.translator.translate(
-                    cursor,
-                    guild_rid=await self.poll.guild_rid(cursor),
-                    key="poll.start.success",
-                    id=self.poll.rid
-                ),
-                ephemeral=True
+        async with interaction.client.unit_of_work("button.start") as unit:
+            snapshot = await self.poll.start(unit.cursor)
+            content = await self.poll.client.translator.translate(
+                unit.cursor,
+                guild_rid=await self.poll.guild_rid(unit.cursor),
+                key="poll.start.success",
+                id=self.poll.hid
             )
-            await self.view.press_start(cursor)
+
+        await interaction.response.send_message(
+            content=content,
+            ephemeral=True
+        )
+        await self.poll.show_started(snapshot)
 
 
 class PollStopButton(ui.Button):
@@ -97,19 +91,23 @@ class PollStopButton(ui.Button):
         self.poll = poll
 
     async def callback(self, interaction: BetterInteraction):
-        async with interaction.client.pool.acquire() as cursor:
-
-            await interaction.response.send_message(
-                content=await self.poll.client.translator.translate(
-                    cursor,
-                    guild_rid=await self.poll.guild_rid(cursor),
-                    key="poll.stop.success",
-                    id=self.poll.rid
-                ),
-                ephemeral=True
+        async with interaction.client.unit_of_work("button.stop") as unit:
+            content = await self.poll.client.translator.translate(
+                unit.cursor,
+                guild_rid=await self.poll.guild_rid(unit.cursor),
+                key="poll.stop.success",
+                id=self.poll.hid
             )
+            snapshot = await self.poll.stop(unit.cursor)
 
-        await self.poll.stop(cursor)
+        # the poll is deleted, nothing may accept votes for it even if the response below fails
+        self.poll.forget()
+
+        await interaction.response.send_message(
+            content=content,
+            ephemeral=True
+        )
+        await self.poll.show_stopped(snapshot)
 
 
 class PollView(ui.View):
@@ -117,49 +115,43 @@ class PollView(ui.View):
         super().__init__(timeout=None)
         self.poll = poll
 
-    async def add_options(self, cursor: Connection):
-        for i, option in enumerate(await self.poll.options(cursor)):
+    def is_finished(self) -> bool:
+        # poll views are only rendered here, their interactions are routed by the PollDispatcher.
+        # reporting them as finished keeps discord.py from storing one view per poll message forever
+        return True
+
+    def add_snapshot_options(self, snapshot: PollSnapshot):
+        for i, _option in enumerate(snapshot.options):
+            option = self.poll.option(_option.rid, _option.name)
             self.add_item(
                 PollOptionButton(
                     option,
-                    label=await option.name(cursor),
+                    label=_option.name,
                     emoji=Emojis.emojis[i],
                     custom_id=f"poll:{self.poll.rid}:option:{option.hid}")
             )
 
         return self
 
-    async def add_stop(self):
+    def add_stop(self):
         self.add_item(PollStopButton(self.poll, f"poll:{self.poll.rid}:stop"))
 
-    async def add_start(self):
+    def add_start(self):
         self.add_item(PollStartButton(self.poll, f"poll:{self.poll.rid}:start"))
 
-    async def press_start(self, cursor: Connection):
-        self.clear_items()
-        await self.add_options(cursor)
-        await self.add_stop()
-
-        message = await self.poll.message_id(cursor)
-        await message.edit(
-            view=self
-        )
-
     async def press_stop(self):
         self.clear_items()
         self.stop()
 
-    async def run(self, cursor: Connection):
-        started = await self.poll.client.database.poll_started(
-            cursor,
-            poll_rid=self.poll.rid
-        )
-
-        if started:
-            await self.add_options(cursor)
-            await self.add_stop()
+    def build(self, snapshot: PollSnapshot):
+        if snapshot.started:
+            self.add_snapshot_options(snapshot)
+            self.add_stop()
 
         else:
-            await self.add_start()
+            self.add_start()
 
         return self
+
+    async def run(self, cursor: Connection):
+        return self.build(await self.poll.snapshot(cursor))
@@ -1,10 +1,15 @@
 import discord
 
 from imp.better import BetterBot
+from imp.better.logger import start_logging
+from imp.better.tree import BetterTree
+from imp.classes import PollSnapshot
 from imp.views.poll import PollView
 from imp.data import config
-from typing import List, Tuple
+from imp.data.colors import Colors
 import asyncio
+import logging
+import time
 from argparse import ArgumentParser
 
 parser = ArgumentParser()
@@ -27,8 +32,10 @@ discord.utils.setup_logging()
 class Bot(BetterBot):
     INIT_COGS = [
         "cogs.main",
-        "cogs.listeners"
+        "cogs.listeners",
+        "cogs.admin"
     ]
+    PREPARE_CHUNK_SIZE = 1000
 
     async def load_cogs(self):
         for cog in self.INIT_COGS:
@@ -41,18 +48,31 @@ class Bot(BetterBot):
         pass
 
     async def prepare_polls(self):
-        async with self.pool.acquire() as cursor:
-            # noinspection SpellCheckingInspection
-            poll_hids: List[Tuple[int, ]] = await cursor.fetch("SELECT id FROM polls")
+        started = time.perf_counter()
+        count = 0
 
-            for _poll_hid, in poll_hids:
-                poll = self.manager.init_poll(self.poll_hashids.encode(_poll_hid))
-                self.log("prepare_polls", f"Added poll: {await poll.title(cursor)}@{poll.rid}")
-                view = await PollView(poll=poll).run(cursor)
-                poll.set_view(view)
+        async with self.acquire("prepare_polls") as cursor:
+            self.manager.tally.load(await self.database.vote_tally(cursor))
 
-                self.add_view(view)
-                self.manager.set_poll(poll)
+            # the server side cursor needs a transaction
+            async with cursor.transaction():
+                async for record in self.database.iter_polls(cursor, chunk_size=self.PREPARE_CHUNK_SIZE):
+                    snapshot = PollSnapshot.from_record(record)
+                    # polls without options have no tally rows, they are tracked so their votes go through memory too
+                    self.manager.tally.track(snapshot.rid)
+                    self.autocomplete.add_snapshot(snapshot)
+                    count += 1
+
+                    # every other poll gets its view built on its first interaction
+                    if snapshot.started and len(self.poll_dispatcher.views) < self.poll_dispatcher.MAX_VIEWS:
+                        poll = self.manager.init_poll(snapshot.rid)
+                        poll.apply_snapshot(snapshot)
+                        poll.set_view(PollView(poll=poll).build(snapshot))
+
+                    if count % self.PREPARE_CHUNK_SIZE == 0:
+                        self.log("prepare_polls", "Prepared %d polls", Colors.GREEN, count)
+
+        self.log("prepare_polls", f"Prepared {count} polls in {time.perf_counter() - started:.2f}s")
 
     async def on_ready(self):
         self.log("on_ready", f"Running as {self.user} with {sys_args.configuration} configuration")
@@ -63,16 +83,26 @@ class Bot(BetterBot):
 
     def prepare_config(self):
         if (_config := getattr(config, sys_args.configuration, None)) is None:
-            self.log("setup_hook", "Invalid configuration!")
+            self.log("setup_hook", "Invalid configuration!", Colors.RED, level=logging.ERROR)
             raise ValueError("Invalid configuration")
         self.config = _config
+        start_logging(**self.config.get("logging", {}))
 
     async def setup_hook(self) -> None:
+        await self.init_migrations()
         await self.init_pool()
         await self.init_hash_ids()
         await self.init_database()
+        await self.init_guild_cache()
         await self.init_translator()
+        await self.init_renderer()
         await self.init_manager()
+        await self.init_scheduler()
+        await self.init_ingest()
+        await self.init_autocomplete()
+        await self.init_dispatcher()
+        await self.init_charts()
+        await self.init_metrics()
         await self.init_hash_ids()
 
         await self.prepare_polls()
@@ -82,8 +112,15 @@ class Bot(BetterBot):
 
 
 async def main():
-    async with Bot("iv", application_id=914581317709070346, intents=discord.Intents.default(), log_handler=None) as bot:
+    async with Bot(
+            "iv",
+            application_id=914581317709070346,
+            intents=discord.Intents.default(),
+            log_handler=None,
+            tree_cls=BetterTree
+    ) as bot:
         bot.prepare_config()
         await bot.start(token=bot.config["token"], reconnect=True)
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())